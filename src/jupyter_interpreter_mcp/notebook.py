@@ -1,10 +1,87 @@
+import asyncio
+import hashlib
+import json
 import logging
 import os
+from collections import OrderedDict
 
-from jupyter_interpreter_mcp.remote import JupyterConnectionError, RemoteJupyterClient
+from jupyter_interpreter_mcp.remote import JupyterNotFoundError, RemoteJupyterClient
 
 logger = logging.getLogger(__name__)
 
+# Appends newly executed code to the history file from inside the kernel.  The
+# write is skipped (and reported as an error) when the file no longer has the
+# size the client last saw, so a stale append can never duplicate or interleave
+# history after a full rewrite.  The helper is removed from the user namespace
+# even when the write is skipped, and uses the builtin open() in case user code
+# shadowed it.
+_APPEND_HISTORY_CODE = """\
+def __jupyter_interpreter_mcp_append(path, data, expected_size):
+    with __import__("builtins").open(path, "ab") as f:
+        if f.seek(0, 2) != expected_size:
+            raise RuntimeError("history file changed since last write")
+        f.write(data)
+try:
+    __jupyter_interpreter_mcp_append({path!r}, {data!r}, {expected_size!r})
+finally:
+    del __jupyter_interpreter_mcp_append
+"""
+
+# Saves the user-defined globals of the kernel with dill.  Underscore names
+# and the objects IPython installs itself (In, Out, get_ipython, ...) are left
+# out so loading a snapshot never replaces the new kernel's own.  The metadata
+# file records how much of the history file the snapshot covers and a digest
+# of that prefix; it is removed before the snapshot is replaced and rewritten
+# afterwards, so it never describes a different snapshot.  __import__ keeps
+# the user namespace free of new names.
+_SNAPSHOT_CODE = """\
+__import__("pathlib").Path({tmp_path!r}).write_bytes(__import__("dill").dumps({{
+    k: v for k, v in globals().items()
+    if not k.startswith("_") and k not in {excluded!r}
+}}))
+__import__("pathlib").Path({meta_path!r}).unlink(missing_ok=True)
+__import__("os").replace({tmp_path!r}, {path!r})
+__import__("pathlib").Path({meta_path!r}).write_text({meta!r})
+"""
+_LOAD_SNAPSHOT_CODE = """\
+globals().update(__import__("dill").loads(
+    __import__("pathlib").Path({path!r}).read_bytes()
+))
+"""
+# Globals the IPython kernel defines for every session
+_KERNEL_GLOBALS = ("In", "Out", "get_ipython", "exit", "quit")
+# Saving or loading a large namespace can take a while without any output
+_SNAPSHOT_TIMEOUT = 300.0
+
+
+# Code blocks containing this line are treated as deterministic: their output is
+# cached and returned without running them again when the same code is resent.
+_MEMOIZE_MARKER = "# @memoize"
+# Maximum number of memoized outputs kept per session (least recently used first)
+_EXEC_CACHE_SIZE = 256
+
+
+def _history_digest(history: bytes | bytearray) -> str:
+    """Returns the digest recorded for the history a snapshot covers.
+
+    :param history: The covered prefix of the history file.
+    :type history: bytes | bytearray
+    :return: Hex digest identifying the history prefix.
+    :rtype: str
+    """
+    return hashlib.blake2b(history, digest_size=16).hexdigest()
+
+
+def _cache_key(code: str) -> str:
+    """Returns the key under which the output of *code* is cached.
+
+    :param code: The executed code block.
+    :type code: str
+    :return: Hex digest identifying the code block.
+    :rtype: str
+    """
+    return hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+
 
 class Notebook:
     """Manages a persistent remote Jupyter kernel session for code execution.
@@ -18,6 +95,9 @@ class Notebook:
     :ivar kernel_id: ID of the remote kernel.
     :ivar file_path: Path to the session history file (on remote filesystem).
     :ivar history: List of successfully executed code blocks.
+    :ivar cache_path: Path to the memoized output cache (on remote filesystem).
+    :ivar snapshot_path: Path to the kernel namespace snapshot (on remote
+        filesystem).
     """
 
     def __init__(
@@ -42,6 +122,32 @@ class Notebook:
         self.kernel_id: str | None = None
         self.file_path: str = os.path.join(session_directory, "history.txt")
         self.history: list[str] = []
+        # Encoded content of the history file, kept up to date as code runs
+        self._history_bytes = bytearray()
+        # Number of leading bytes of _history_bytes known to be in the history
+        # file, or None if the state of the file is unknown
+        self._flushed_len: int | None = None
+        # Serialises dumps: the history writer and eviction may both save
+        self._dump_lock = asyncio.Lock()
+
+        self.cache_path: str = os.path.join(session_directory, "history.cache.json")
+        # Outputs of code blocks marked with _MEMOIZE_MARKER, keyed by _cache_key()
+        self._exec_cache: OrderedDict[str, dict[str, list[str]]] = OrderedDict()
+        self._exec_cache_loaded = False
+        self._exec_cache_dirty = False
+
+        self.snapshot_path: str = os.path.join(session_directory, "session.pkl")
+        self._snapshot_meta_path = self.snapshot_path + ".json"
+        # Number of executions currently running in the kernel
+        self._running = 0
+
+    @property
+    def is_busy(self) -> bool:
+        """Whether code sent through :meth:`execute_new_code` is still running.
+
+        :rtype: bool
+        """
+        return self._running > 0
 
     async def connect(self) -> None:
         """Connects to a remote Jupyter kernel asynchronously.
@@ -54,7 +160,11 @@ class Notebook:
     async def execute_new_code(self, code: str) -> dict[str, list[str]]:
         """Executes code in the kernel and returns results.
 
-        Supports both Python code and bash commands.
+        Supports both Python code and bash commands.  Code containing a
+        ``# @memoize`` line is assumed to be deterministic and free of side
+        effects: once it has run successfully its output is cached (and
+        persisted next to the history file), and sending the same code again
+        returns the cached output without executing it.
 
         :param code: The code to execute (Python or bash).
         :type code: str
@@ -67,30 +177,260 @@ class Notebook:
         if self.kernel_id is None:
             raise RuntimeError("Notebook is not connected. Call connect() first.")
 
-        # Execute code via WebSocket using the remote client
-        result = await self.remote_client.execute(self.kernel_id, code)
+        memoize = any(line.strip() == _MEMOIZE_MARKER for line in code.splitlines())
+        # Counts as running from the cache lookup on, which may have to wait
+        # for the cache file
+        self._running += 1
+        try:
+            if memoize:
+                key = _cache_key(code)
+                cached = await self._get_cached_output(key)
+                if cached is not None:
+                    return cached
+
+            # Execute code via WebSocket using the remote client
+            result = await self.remote_client.execute(self.kernel_id, code)
+        finally:
+            self._running -= 1
 
         # Update history only if no errors
         if len(result["error"]) == 0:
             self.history.append("\n" + code)
+            self._history_bytes += ("\n" + code + "\n").encode("utf-8")
+            if memoize:
+                self._exec_cache[key] = {"error": [], "result": list(result["result"])}
+                if len(self._exec_cache) > _EXEC_CACHE_SIZE:
+                    self._exec_cache.popitem(last=False)
+                self._exec_cache_dirty = True
 
         return result
 
+    async def _get_cached_output(self, key: str) -> dict[str, list[str]] | None:
+        """Returns the cached output for *key*, loading the cache file once.
+
+        :param key: Cache key of the code block, as returned by ``_cache_key``.
+        :type key: str
+        :return: A copy of the cached result, or None if it is not cached.
+        :rtype: dict[str, list[str]] | None
+        """
+        if not self._exec_cache_loaded:
+            self._exec_cache_loaded = True
+            try:
+                contents = await asyncio.to_thread(
+                    self.remote_client.get_file_contents, self.cache_path
+                )
+                stored = json.loads(contents["content"])
+            except Exception:
+                # Missing or unreadable cache file: start with an empty cache
+                stored = {}
+            if isinstance(stored, dict):
+                for stored_key, output in stored.items():
+                    if isinstance(output, dict) and isinstance(
+                        output.get("result"), list
+                    ):
+                        self._exec_cache.setdefault(
+                            stored_key, {"error": [], "result": output["result"]}
+                        )
+
+        cached = self._exec_cache.get(key)
+        if cached is None:
+            return None
+        self._exec_cache.move_to_end(key)
+        return {"error": [], "result": list(cached["result"])}
+
     async def dump_to_file(self) -> None:
         """Saves the execution history to a file on the remote filesystem.
 
-        Writes the history file directly via the Jupyter Contents API without
-        executing code on the kernel.
+        Only code executed since the last dump is sent: it is appended to the
+        history file by the kernel itself, so the amount of data transferred
+        does not grow with the length of the session.  When the size of the
+        file on disk is unknown or the append fails, the whole history is
+        written via the Jupyter Contents API instead.  Nothing is written when
+        no code has been executed since the last successful dump.  Newly
+        memoized outputs are saved to ``cache_path``.  Concurrent dumps run
+        one after the other.
+        """
+        async with self._dump_lock:
+            if len(self._history_bytes) > (self._flushed_len or 0):
+                await self._dump_history()
+
+            if self._exec_cache_dirty:
+                # Serialise now: outputs memoized during the write mark it
+                # dirty again
+                cache = json.dumps(self._exec_cache)
+                self._exec_cache_dirty = False
+                try:
+                    await asyncio.to_thread(
+                        self.remote_client.put_contents,
+                        self.cache_path,
+                        cache,
+                        format="text",
+                    )
+                except Exception:
+                    self._exec_cache_dirty = True
+                    raise
+
+    async def _dump_history(self) -> None:
+        """Writes code executed since the last dump to the history file."""
+        # Code executed while the append is in flight is left for the next dump
+        end = len(self._history_bytes)
+        if self._flushed_len is not None and self.kernel_id is not None:
+            data = bytes(self._history_bytes[self._flushed_len : end])
+            append_code = _APPEND_HISTORY_CODE.format(
+                path=self.file_path, data=data, expected_size=self._flushed_len
+            )
+            try:
+                result = await self.remote_client.execute(
+                    self.kernel_id,
+                    append_code,
+                    store_history=False,
+                    stop_on_error=False,
+                )
+                appended = len(result["error"]) == 0
+            except Exception:
+                appended = False
+            if appended:
+                self._flushed_len = end
+                self.remote_client.forget_missing(self.file_path)
+                return
+            logger.debug(
+                "Appending history for session %s failed, rewriting file",
+                self.session_id,
+            )
+
+        if self._flushed_len == 0:
+            # The file was missing when the session was loaded; keep anything
+            # written to it since (e.g. by another server) instead of
+            # replacing it
+            try:
+                existing = await asyncio.to_thread(
+                    self.remote_client.get_file_contents, self.file_path
+                )
+            except JupyterNotFoundError:
+                pass
+            else:
+                self._history_bytes[:0] = existing["content"].encode("utf-8")
+        content = self._history_bytes.decode("utf-8")
+        await asyncio.to_thread(
+            self.remote_client.put_contents, self.file_path, content, format="text"
+        )
+        self._flushed_len = len(self._history_bytes)
+
+    async def snapshot(self, timeout: float = _SNAPSHOT_TIMEOUT) -> bool:
+        """Saves the kernel's global namespace next to the history file.
+
+        The history is dumped first, then the user-defined globals are pickled
+        inside the kernel with ``dill`` and saved to ``snapshot_path`` along
+        with how much of the history they cover, so that :meth:`load_from_file`
+        only needs to replay code executed after the snapshot.  No snapshot is
+        taken while code is running, since its effects would be saved without
+        being covered.
+
+        :param timeout: Maximum time in seconds to wait for the kernel to save
+            the namespace.
+        :type timeout: float
+        :return: True if a snapshot was saved, False if the kernel could not
+            take one (e.g. ``dill`` is not installed in the kernel or the
+            namespace holds objects that cannot be pickled).
+        :rtype: bool
         """
-        content = "".join(line + "\n" for line in self.history)
-        self.remote_client.put_contents(self.file_path, content, format="text")
+        if self.kernel_id is None:
+            return False
+
+        await self.dump_to_file()
+        history_offset = len(self._history_bytes)
+        if self._flushed_len != history_offset or self._running:
+            return False
+
+        snapshot_code = _SNAPSHOT_CODE.format(
+            tmp_path=self.snapshot_path + ".tmp",
+            path=self.snapshot_path,
+            meta_path=self._snapshot_meta_path,
+            meta=json.dumps(
+                {
+                    "history_offset": history_offset,
+                    "history_digest": _history_digest(self._history_bytes),
+                }
+            ),
+            excluded=_KERNEL_GLOBALS,
+        )
+        try:
+            result = await self.remote_client.execute(
+                self.kernel_id,
+                snapshot_code,
+                timeout=timeout,
+                store_history=False,
+                stop_on_error=False,
+            )
+        except Exception:
+            result = {"error": ["snapshot request failed"], "result": []}
+        if result["error"]:
+            logger.debug(
+                "Could not snapshot session %s: %s",
+                self.session_id,
+                "; ".join(result["error"]),
+            )
+            return False
+        self.remote_client.forget_missing(self._snapshot_meta_path)
+        return True
+
+    async def _load_snapshot(self, kernel_id: str) -> int:
+        """Loads the kernel namespace snapshot, if there is a usable one.
+
+        :param kernel_id: ID of the kernel to load the snapshot into.
+        :type kernel_id: str
+        :return: Number of leading history bytes covered by the loaded
+            snapshot, or 0 if no snapshot was loaded.
+        :rtype: int
+        """
+        if self.remote_client.known_missing(self._snapshot_meta_path):
+            return 0
+        try:
+            contents = await asyncio.to_thread(
+                self.remote_client.get_file_contents, self._snapshot_meta_path
+            )
+            meta = json.loads(contents["content"])
+            history_offset = meta["history_offset"]
+            history_digest = meta["history_digest"]
+        except Exception:
+            return 0
+        if not isinstance(history_offset, int) or not 0 < history_offset <= len(
+            self._history_bytes
+        ):
+            return 0
+        # The history file may have been rewritten since the snapshot was taken
+        if history_digest != _history_digest(self._history_bytes[:history_offset]):
+            return 0
+
+        try:
+            result = await self.remote_client.execute(
+                kernel_id,
+                _LOAD_SNAPSHOT_CODE.format(path=self.snapshot_path),
+                timeout=_SNAPSHOT_TIMEOUT,
+                store_history=False,
+                stop_on_error=False,
+            )
+        except Exception:
+            return 0
+        if result["error"]:
+            logger.debug(
+                "Could not load snapshot of session %s, replaying history: %s",
+                self.session_id,
+                "; ".join(result["error"]),
+            )
+            return 0
+        return history_offset
 
     async def load_from_file(self) -> bool:
         """Loads and re-executes code from the session history file.
 
-        Reads the history file via the Jupyter Contents API and re-executes
-        its content to restore the kernel state.  The restored code is executed
-        but NOT added to history again (it is already in the saved history).
+        Reads the history file with a single Jupyter Contents API request and
+        re-executes its content to restore the kernel state.  When a snapshot
+        saved by :meth:`snapshot` covers part of the history, it is loaded
+        instead and only the code executed after it is replayed; if loading
+        it fails, the whole history is replayed.  The restored code is
+        executed but NOT added to history again (it is already in the saved
+        history).
 
         :return: True if the file was successfully loaded and executed (or if
             no history file exists yet), False if an error occurred.
@@ -101,32 +441,41 @@ class Notebook:
             raise RuntimeError("Notebook is not connected. Call connect() first.")
 
         try:
-            # First, explicitly check whether the history file exists. Only a confirmed
-            # "not found" should be treated as a benign fresh-session condition.
-            try:
-                if not self.remote_client.check_exists(self.file_path):
-                    # File does not exist — fresh session with no prior history.
-                    self.history = []
-                    return True
-            except JupyterConnectionError:
-                # Connectivity issue while checking existence;
-                # do not treat as file-not-found.
-                return False
-
-            contents = self.remote_client.get_file_contents(self.file_path)
-        except JupyterConnectionError:
-            # Connectivity issue while fetching contents; treat as a load failure.
-            return False
+            # A single GET both checks for the file and fetches it, and is
+            # skipped when the client already saw the file missing. Only a
+            # confirmed "not found" is treated as a benign fresh-session
+            # condition; connectivity issues are load failures.
+            if self.remote_client.known_missing(self.file_path):
+                raise JupyterNotFoundError(f"File not found: {self.file_path}")
+            contents = await asyncio.to_thread(
+                self.remote_client.get_file_contents, self.file_path
+            )
+        except JupyterNotFoundError:
+            # File does not exist — fresh session with no prior history.
+            self.history = []
+            self._history_bytes = bytearray()
+            self._flushed_len = 0
+            return True
         except Exception:
             return False
 
         file_content = contents["content"].strip()
+        self._history_bytes = bytearray(contents["content"].encode("utf-8"))
+        self._flushed_len = len(self._history_bytes)
 
         if file_content:
             self.history = [file_content]
+            history_offset = await self._load_snapshot(self.kernel_id)
+            replay = (
+                self._history_bytes[history_offset:].decode("utf-8").strip()
+                if history_offset
+                else file_content
+            )
+            if not replay:
+                return True
             try:
                 restore_result = await self.remote_client.execute(
-                    self.kernel_id, file_content
+                    self.kernel_id, replay
                 )
                 return len(restore_result["error"]) == 0
             except Exception:
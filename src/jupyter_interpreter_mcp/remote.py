@@ -1,14 +1,20 @@
 """Remote Jupyter server client for kernel management and execution."""
 
 import asyncio
+import contextlib
 import json
 import posixpath
+import sys
 import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Any, cast
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 import requests
 import websockets
+from requests.adapters import HTTPAdapter
+from websockets.exceptions import ConnectionClosed
 
 
 class JupyterConnectionError(Exception):
@@ -17,6 +23,12 @@ class JupyterConnectionError(Exception):
     pass
 
 
+class JupyterNotFoundError(JupyterConnectionError):
+    """Raised when a path does not exist on the Jupyter server."""
+
+    pass
+
+
 class JupyterAuthError(Exception):
     """Raised when authentication fails."""
 
@@ -29,6 +41,95 @@ class JupyterExecutionError(Exception):
     pass
 
 
+# Serialized execute_request message with placeholders for the message ID,
+# session ID, JSON-encoded code and the store_history and stop_on_error flags.
+# Filling it in avoids building and serializing the whole message dict on
+# every execution.
+_EXECUTE_REQUEST_TEMPLATE = (
+    '{"header":{"msg_id":"%s","username":"","session":"%s",'
+    '"msg_type":"execute_request","version":"5.3"},'
+    '"parent_header":{},"metadata":{},'
+    '"content":{"code":%s,"silent":false,"store_history":%s,'
+    '"user_expressions":{},"allow_stdin":false,"stop_on_error":%s},'
+    '"channel":"shell"}'
+)
+
+# Largest kernel message accepted over the WebSocket, in bytes
+_MAX_MESSAGE_SIZE = 2**24
+
+# Upper bound on Contents API paths remembered as missing (or as written) per
+# client
+_KNOWN_MISSING_SIZE = 1024
+
+
+def _on_stream(msg: dict[str, Any], result: list[str], error: list[str]) -> bool:
+    result.append(msg["content"]["text"])
+    return False
+
+
+def _on_execute_result(
+    msg: dict[str, Any], result: list[str], error: list[str]
+) -> bool:
+    result.append(f"Execution Result: {msg['content']['data']['text/plain']}")
+    return False
+
+
+def _on_error(msg: dict[str, Any], result: list[str], error: list[str]) -> bool:
+    error.append(f"Error: {msg['content']['ename']}: {msg['content']['evalue']}")
+    return False
+
+
+def _on_execute_reply(msg: dict[str, Any], result: list[str], error: list[str]) -> bool:
+    # An earlier request on the kernel failed with stop_on_error set
+    if msg["content"].get("status") == "aborted":
+        error.append("Error: Aborted: a previous execution on the kernel failed")
+    return False
+
+
+def _on_status(msg: dict[str, Any], result: list[str], error: list[str]) -> bool:
+    # Execution complete once the kernel goes back to idle
+    return bool(msg["content"]["execution_state"] == "idle")
+
+
+# Reply handlers by msg_type, looked up once per message; each returns True
+# when the request has finished
+_MESSAGE_HANDLERS: dict[str, Callable[[dict[str, Any], list[str], list[str]], bool]] = {
+    "stream": _on_stream,
+    "execute_result": _on_execute_result,
+    "error": _on_error,
+    "execute_reply": _on_execute_reply,
+    "status": _on_status,
+}
+
+
+@dataclass
+class _KernelConnection:
+    """WebSocket connection to a kernel, reused across executions.
+
+    Several executions may be in flight on one connection; the kernel runs
+    them in the order they were sent, and a reader task routes each reply to
+    the execution it belongs to.
+
+    :ivar loop: Event loop the connection belongs to.
+    :ivar url: URL of the kernel's channels endpoint.
+    :ivar lock: Serialises connecting and sending on the connection.
+    :ivar websocket: Open WebSocket, or ``None`` until first use.
+    :ivar replies: Queues of the executions waiting for replies on
+        ``websocket``, keyed by execute_request message ID.
+    :ivar reader: Task routing replies while any execution is waiting.
+    :ivar last_activity: Loop time of the last request sent or message
+        received.
+    """
+
+    loop: asyncio.AbstractEventLoop
+    url: str
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    websocket: Any = None
+    replies: dict[str, asyncio.Queue[Any]] = field(default_factory=dict)
+    reader: asyncio.Task[None] | None = None
+    last_activity: float = 0.0
+
+
 class RemoteJupyterClient:
     """Client for interacting with remote Jupyter server.
 
@@ -63,6 +164,34 @@ class RemoteJupyterClient:
         self.timeout = timeout
         self.jupyter_root = jupyter_root
 
+        # WebSocket counterpart of base_url (http(s) -> ws(s)), keeping any
+        # path prefix the server is mounted under
+        parsed = urlparse(self.base_url)
+        ws_scheme = "wss" if parsed.scheme == "https" else "ws"
+        self._ws_base = f"{ws_scheme}://{parsed.netloc}{parsed.path}"
+
+        # The token never changes, so the headers are built only once
+        self._base_headers = {"Content-Type": "application/json"}
+        if auth_token:
+            self._base_headers["Authorization"] = f"token {auth_token}"
+
+        # Reuse TCP/TLS connections across REST calls instead of reconnecting
+        # for every request.
+        self._session = requests.Session()
+        self._session.headers.update(self._base_headers)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        # One WebSocket per kernel, kept open between executions
+        self._ws_connections: dict[str, _KernelConnection] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+
+        # Contents API paths the server last reported as not found, and paths
+        # this client created (which it no longer trusts a cached 404 for)
+        self._known_missing: set[str] = set()
+        self._written: set[str] = set()
+
     def _to_api_path(self, absolute_path: str) -> str:
         """Convert an absolute remote filesystem path to a Contents API path.
 
@@ -115,16 +244,74 @@ class RemoteJupyterClient:
             )
         return normalised
 
+    def _record_missing(self, api_path: str, missing: bool) -> None:
+        """Remember whether the server reported *api_path* as not found.
+
+        :param api_path: Resolved Contents API path.
+        :type api_path: str
+        :param missing: True if the path was not found, False if it exists.
+        :type missing: bool
+        """
+        if not missing:
+            self._known_missing.discard(api_path)
+            return
+        if api_path in self._written:
+            return
+        if len(self._known_missing) >= _KNOWN_MISSING_SIZE:
+            self._known_missing.clear()
+        self._known_missing.add(api_path)
+
+    def _record_written(self, api_path: str) -> None:
+        """Remember that *api_path* was created, so it is never again assumed
+        to be missing.
+
+        A file that was written once may be deleted and recreated by other
+        means (e.g. from kernel code) at any time, so a later 404 for it is
+        not cached.
+
+        :param api_path: Resolved Contents API path.
+        :type api_path: str
+        """
+        self._known_missing.discard(api_path)
+        if len(self._written) >= _KNOWN_MISSING_SIZE:
+            self._written.clear()
+        self._written.add(api_path)
+
+    def known_missing(self, path: str) -> bool:
+        """Check whether *path* was not found the last time it was requested.
+
+        Answered from client-side state without a request.  Only a 404 for a
+        file this client never wrote is remembered; after creating a file by
+        other means (e.g. from kernel code), call :meth:`forget_missing`.
+
+        :param path: Absolute filesystem path or path relative to the
+            Jupyter root.
+        :type path: str
+        :return: True if the last lookup of *path* returned 404.
+        :rtype: bool
+        :raises ValueError: If *path* is outside ``jupyter_root`` or escapes via
+            ``..`` components.
+        """
+        return self._resolve_path(path) in self._known_missing
+
+    def forget_missing(self, path: str) -> None:
+        """Forget that *path* was not found, e.g. after creating it.
+
+        :param path: Absolute filesystem path or path relative to the
+            Jupyter root.
+        :type path: str
+        :raises ValueError: If *path* is outside ``jupyter_root`` or escapes via
+            ``..`` components.
+        """
+        self._record_written(self._resolve_path(path))
+
     def _get_auth_headers(self) -> dict[str, str]:
         """Build authentication headers for requests.
 
         :return: Dictionary of headers including authorization
         :rtype: dict[str, str]
         """
-        headers = {"Content-Type": "application/json"}
-        if self.auth_token:
-            headers["Authorization"] = f"token {self.auth_token}"
-        return headers
+        return self._base_headers.copy()
 
     def _make_request(
         self, method: str, endpoint: str, **kwargs: Any
@@ -141,20 +328,18 @@ class RemoteJupyterClient:
         :raises JupyterConnectionError: If connection fails
         :raises JupyterAuthError: If authentication fails
         """
-        url = urljoin(self.base_url, endpoint)
-        headers = self._get_auth_headers()
-
-        # Merge provided headers with auth headers
-        if "headers" in kwargs:
-            headers.update(kwargs["headers"])
-        kwargs["headers"] = headers
+        if not endpoint.startswith("/"):
+            endpoint = "/" + endpoint
+        url = f"{self.base_url}{endpoint}"
 
         # Set timeout if not provided
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.timeout
 
         try:
-            response = requests.request(method, url, **kwargs)
+            # Auth headers are set on the session; headers passed in kwargs are
+            # merged on top of them by requests.
+            response = self._session.request(method, url, **kwargs)
 
             # Check for authentication errors
             if response.status_code == 401:
@@ -179,6 +364,10 @@ class RemoteJupyterClient:
                 f"Request to {url} timed out after {self.timeout}s: {e}"
             ) from e
 
+    def close(self) -> None:
+        """Close pooled HTTP connections held by this client."""
+        self._session.close()
+
     def validate_connection(self) -> bool:
         """Validate that we can connect to the Jupyter server.
 
@@ -209,6 +398,25 @@ class RemoteJupyterClient:
         kernel_id: str = data["id"]
         return kernel_id
 
+    def is_kernel_alive(self, kernel_id: str) -> bool:
+        """Check whether a kernel still exists and has not died.
+
+        :param kernel_id: ID of the kernel to check
+        :type kernel_id: str
+        :return: False if the kernel is unknown to the server (e.g. culled
+            while idle) or reported dead, True otherwise
+        :rtype: bool
+        :raises JupyterConnectionError: If connection fails
+        :raises JupyterAuthError: If authentication fails
+        """
+        try:
+            response = self._make_request("GET", f"/api/kernels/{kernel_id}")
+        except requests.HTTPError as e:
+            if e.response.status_code == 404:
+                return False
+            raise
+        return bool(response.json().get("execution_state") != "dead")
+
     def shutdown_kernel(self, kernel_id: str) -> None:
         """Shutdown a kernel.
 
@@ -216,14 +424,206 @@ class RemoteJupyterClient:
         :type kernel_id: str
         :raises JupyterConnectionError: If connection fails
         """
+        self._discard_connection(kernel_id)
         self._make_request("DELETE", f"/api/kernels/{kernel_id}")
 
+    def _kernel_connection(self, kernel_id: str) -> _KernelConnection:
+        """Return the cached connection for *kernel_id* on the running loop.
+
+        A connection created on a different event loop cannot be used any
+        more and is replaced.
+
+        :param kernel_id: ID of the kernel
+        :type kernel_id: str
+        :return: Connection entry for the kernel
+        :rtype: _KernelConnection
+        """
+        loop = asyncio.get_running_loop()
+        connection = self._ws_connections.get(kernel_id)
+        if connection is None or connection.loop is not loop:
+            url = f"{self._ws_base}/api/kernels/{kernel_id}/channels"
+            # Add token to URL if using token auth
+            if self.auth_token:
+                url += f"?token={self.auth_token}"
+            connection = _KernelConnection(loop=loop, url=url)
+            self._ws_connections[kernel_id] = connection
+        return connection
+
+    async def _submit(
+        self, connection: _KernelConnection, msg_id: str, data: str
+    ) -> asyncio.Queue[Any]:
+        """Send a request over the connection's WebSocket, connecting if needed.
+
+        A cached WebSocket that turns out to be closed is replaced once; this
+        is safe because a failed send never reached the kernel.
+
+        :param connection: Connection entry to send on
+        :type connection: _KernelConnection
+        :param msg_id: Message ID of the request
+        :type msg_id: str
+        :param data: Serialised request to send
+        :type data: str
+        :return: Queue receiving the parsed replies to the request, or the
+            exception that ended the connection
+        :rtype: asyncio.Queue
+        """
+        async with connection.lock:
+            if connection.websocket is not None:
+                queue = self._expect_replies(connection, msg_id)
+                try:
+                    await connection.websocket.send(data)
+                    return queue
+                except ConnectionClosed:
+                    await self._close_websocket(connection)
+
+            # Per-message compression only adds latency for small kernel
+            # messages.  The default 1 MiB frame limit is too small for large
+            # outputs (e.g. long tracebacks or printed data frames).
+            connection.websocket = await websockets.connect(
+                connection.url, compression=None, max_size=_MAX_MESSAGE_SIZE
+            )
+            queue = self._expect_replies(connection, msg_id)
+            await connection.websocket.send(data)
+            return queue
+
+    def _expect_replies(
+        self, connection: _KernelConnection, msg_id: str
+    ) -> asyncio.Queue[Any]:
+        """Register a reply queue for *msg_id* and make sure replies are read.
+
+        :param connection: Connection entry the request is sent on
+        :type connection: _KernelConnection
+        :param msg_id: Message ID of the request
+        :type msg_id: str
+        :return: Queue the reader task puts the request's replies on
+        :rtype: asyncio.Queue
+        """
+        queue: asyncio.Queue[Any] = asyncio.Queue()
+        connection.replies[msg_id] = queue
+        connection.last_activity = connection.loop.time()
+        if connection.reader is None or connection.reader.done():
+            connection.reader = connection.loop.create_task(
+                self._read_replies(connection, connection.websocket, connection.replies)
+            )
+        return queue
+
+    @staticmethod
+    async def _read_replies(
+        connection: _KernelConnection,
+        websocket: Any,
+        replies: dict[str, asyncio.Queue[Any]],
+    ) -> None:
+        """Route messages from *websocket* to the executions waiting for them.
+
+        Runs until no execution is waiting any more.  Messages for requests
+        nobody waits for (e.g. abandoned after a timeout) are dropped.  If the
+        WebSocket fails, every waiting execution receives the exception.
+
+        :param connection: Connection entry the WebSocket belongs to
+        :type connection: _KernelConnection
+        :param websocket: WebSocket to read from
+        :param replies: Reply queues of the requests sent on *websocket*
+        :type replies: dict[str, asyncio.Queue]
+        """
+        try:
+            while replies:
+                message = await websocket.recv()
+                connection.last_activity = connection.loop.time()
+
+                # Binary frames carry messages with buffers (e.g. widget
+                # comms), never output collected here.  Replies embed the
+                # request's msg_id verbatim, so frames not containing any
+                # awaited ID are skipped without being parsed.
+                if not isinstance(message, str) or not any(
+                    msg_id in message for msg_id in replies
+                ):
+                    continue
+
+                msg = json.loads(message)
+                parent_msg_id = msg.get("parent_header", {}).get("msg_id", "")
+                queue = replies.get(parent_msg_id)
+                if queue is None:
+                    continue
+                if (
+                    msg.get("msg_type") == "status"
+                    and msg["content"]["execution_state"] == "idle"
+                ):
+                    # Last message of the request
+                    del replies[parent_msg_id]
+                queue.put_nowait(msg)
+        except Exception as e:
+            if connection.websocket is websocket:
+                connection.websocket = None
+            for queue in replies.values():
+                queue.put_nowait(e)
+            replies.clear()
+
+    async def _close_websocket(self, connection: _KernelConnection) -> None:
+        """Close and forget the connection's WebSocket, ignoring errors.
+
+        Executions still waiting for replies on it fail.
+
+        :param connection: Connection entry whose WebSocket should be closed
+        :type connection: _KernelConnection
+        """
+        websocket, connection.websocket = connection.websocket, None
+        reader, connection.reader = connection.reader, None
+        replies, connection.replies = connection.replies, {}
+        if reader is not None:
+            reader.cancel()
+        for queue in replies.values():
+            queue.put_nowait(JupyterExecutionError("Kernel connection closed"))
+        if websocket is not None:
+            with contextlib.suppress(Exception):
+                await websocket.close()
+
+    async def close_kernel_connection(self, kernel_id: str) -> None:
+        """Close the cached WebSocket for *kernel_id*, if any.
+
+        Call this on the event loop before shutting the kernel down from a
+        worker thread, where :meth:`shutdown_kernel` cannot close it.
+
+        :param kernel_id: ID of the kernel
+        :type kernel_id: str
+        """
+        connection = self._ws_connections.get(kernel_id)
+        if connection is None or connection.loop is not asyncio.get_running_loop():
+            return
+        del self._ws_connections[kernel_id]
+        await self._close_websocket(connection)
+
+    def _discard_connection(self, kernel_id: str) -> None:
+        """Drop the cached WebSocket for *kernel_id* and close it if possible.
+
+        :param kernel_id: ID of the kernel
+        :type kernel_id: str
+        """
+        connection = self._ws_connections.pop(kernel_id, None)
+        if connection is None or connection.websocket is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if connection.loop is loop:
+            task = loop.create_task(self._close_websocket(connection))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
     async def execute(
-        self, kernel_id: str, code: str, timeout: float = 30.0
+        self,
+        kernel_id: str,
+        code: str,
+        timeout: float = 30.0,
+        store_history: bool = True,
+        stop_on_error: bool = True,
     ) -> dict[str, list[str]]:
         """Execute code via WebSocket and return structured results.
 
-        Supports both Python code and bash commands.
+        Supports both Python code and bash commands.  The WebSocket to each
+        kernel is opened on first use and kept open for later executions until
+        the kernel is shut down.  Concurrent executions on the same kernel are
+        sent without waiting for each other; the kernel runs them in order.
 
         :param kernel_id: ID of the kernel to execute code in
         :type kernel_id: str
@@ -231,94 +631,138 @@ class RemoteJupyterClient:
         :type code: str
         :param timeout: Maximum time to wait for execution completion in seconds
         :type timeout: float
+        :param store_history: Whether the kernel should record the code in its
+            input history and execution count.  Pass ``False`` for internal
+            bookkeeping code that the user should not see.
+        :type store_history: bool
+        :param stop_on_error: Whether the kernel should abort requests queued
+            behind this one if it fails (the kernel's default).  Aborted
+            requests are reported as errors.
+        :type stop_on_error: bool
         :return: Dictionary with 'error' and 'result' keys. 'error' contains
             list of error messages (empty if successful). 'result' contains
             list of output strings and execution results.
         :rtype: dict[str, list[str]]
         :raises JupyterExecutionError: If execution fails or times out
         """
-        # Convert http(s) to ws(s)
-        parsed = urlparse(self.base_url)
-        ws_scheme = "wss" if parsed.scheme == "https" else "ws"
-        ws_url = f"{ws_scheme}://{parsed.netloc}/api/kernels/{kernel_id}/channels"
-
-        # Add token to URL if using token auth
-        if self.auth_token:
-            ws_url += f"?token={self.auth_token}"
-
-        result: list[str] = []
-        error: list[str] = []
+        # Send execute_request message; only the code needs JSON encoding
+        msg_id = str(uuid.uuid4())
+        execute_request = _EXECUTE_REQUEST_TEMPLATE % (
+            msg_id,
+            uuid.uuid4(),
+            json.dumps(code),
+            "true" if store_history else "false",
+            "true" if stop_on_error else "false",
+        )
 
+        connection = self._kernel_connection(kernel_id)
         try:
-            async with websockets.connect(ws_url) as websocket:
-                # Send execute_request message
-                msg_id = str(uuid.uuid4())
-                execute_request = {
-                    "header": {
-                        "msg_id": msg_id,
-                        "username": "",
-                        "session": str(uuid.uuid4()),
-                        "msg_type": "execute_request",
-                        "version": "5.3",
-                    },
-                    "parent_header": {},
-                    "metadata": {},
-                    "content": {
-                        "code": code,
-                        "silent": False,
-                        "store_history": True,
-                        "user_expressions": {},
-                        "allow_stdin": False,
-                    },
-                    "channel": "shell",
-                }
-
-                await websocket.send(json.dumps(execute_request))
-
-                # Collect output from messages
-                # Only collect messages that are responses to our execute_request
-                while True:
-                    try:
-                        message = await asyncio.wait_for(
-                            websocket.recv(), timeout=timeout
-                        )
-                        msg = json.loads(message)
-
-                        # Only process messages that are replies to our request
-                        parent_msg_id = msg.get("parent_header", {}).get("msg_id", "")
-                        if parent_msg_id != msg_id:
-                            continue
-
-                        msg_type = msg.get("msg_type", "")
-
-                        if msg_type == "stream":
-                            result.append(msg["content"]["text"])
-                        elif msg_type == "execute_result":
-                            plain_text = msg["content"]["data"]["text/plain"]
-                            result.append(f"Execution Result: {plain_text}")
-                        elif msg_type == "error":
-                            ename = msg["content"]["ename"]
-                            evalue = msg["content"]["evalue"]
-                            error.append(f"Error: {ename}: {evalue}")
-                        elif (
-                            msg_type == "status"
-                            and msg["content"]["execution_state"] == "idle"
-                        ):
-                            # Execution complete
-                            break
-
-                    except asyncio.TimeoutError as e:
-                        raise JupyterExecutionError(
-                            f"Code execution timed out after {timeout}s"
-                        ) from e
+            queue = await self._submit(connection, msg_id, execute_request)
+        except Exception as e:
+            await self._close_websocket(connection)
+            raise JupyterExecutionError(f"Failed to execute code: {e}") from e
 
+        try:
+            return await self._collect_output(connection, queue, timeout)
+        except asyncio.TimeoutError as e:
+            raise JupyterExecutionError(
+                f"Code execution timed out after {timeout}s"
+            ) from e
         except JupyterExecutionError:
-            # Re-raise our own exceptions
             raise
         except Exception as e:
             raise JupyterExecutionError(f"Failed to execute code: {e}") from e
+        finally:
+            # Stop routing replies nobody waits for any more
+            if connection.replies.get(msg_id) is queue:
+                del connection.replies[msg_id]
+                if not connection.replies and connection.reader is not None:
+                    connection.reader.cancel()
+                    connection.reader = None
+
+    @staticmethod
+    def _handle_message(
+        msg: dict[str, Any], result: list[str], error: list[str]
+    ) -> bool:
+        """Record the output carried by one reply to an execute_request.
+
+        :param msg: Parsed message received from the kernel channels endpoint
+        :type msg: dict[str, Any]
+        :param result: List that output and execution results are appended to
+        :type result: list[str]
+        :param error: List that error messages are appended to
+        :type error: list[str]
+        :return: True once the kernel reports the request finished (idle)
+        :rtype: bool
+        """
+        handler = _MESSAGE_HANDLERS.get(msg.get("msg_type", ""))
+        return handler is not None and handler(msg, result, error)
+
+    @staticmethod
+    async def _next_reply(queue: asyncio.Queue[Any], timeout: float) -> Any:
+        """Return the next reply from *queue*, waiting at most *timeout* seconds.
+
+        :param queue: Queue receiving the replies to a request
+        :type queue: asyncio.Queue
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float
+        :return: Parsed message, or the exception that ended the connection
+        :raises asyncio.TimeoutError: If no reply arrives within *timeout*
+        """
+        # Replies often arrive in bursts; only wait when none is buffered
+        if not queue.empty():
+            return queue.get_nowait()
+        if sys.version_info >= (3, 11):
+            # Cancels the wait in place, where wait_for() before Python 3.12
+            # schedules an extra task for every message
+            async with asyncio.timeout(timeout):
+                return await queue.get()
+        return await asyncio.wait_for(queue.get(), timeout=timeout)
+
+    async def _collect_output(
+        self,
+        connection: _KernelConnection,
+        queue: asyncio.Queue[Any],
+        timeout: float,
+    ) -> dict[str, list[str]]:
+        """Read replies from *queue* until the kernel goes idle.
+
+        *timeout* bounds the wait for each message, not the whole execution,
+        so long-running code that keeps producing output is not cut off.
+        While the request is still queued behind other executions on the
+        kernel, any traffic on the connection counts as progress.
+
+        :param connection: Connection entry the request was sent on
+        :type connection: _KernelConnection
+        :param queue: Queue receiving the replies to the request
+        :type queue: asyncio.Queue
+        :param timeout: Maximum time to wait for the next message in seconds
+        :type timeout: float
+        :return: Dictionary with 'error' and 'result' keys
+        :rtype: dict[str, list[str]]
+        :raises asyncio.TimeoutError: If no message arrives within *timeout*
+        """
+        result: list[str] = []
+        error: list[str] = []
+        started = False
+        wait = timeout
 
-        return {"error": error, "result": result}
+        while True:
+            try:
+                msg = await self._next_reply(queue, wait)
+            except asyncio.TimeoutError:
+                idle = connection.loop.time() - connection.last_activity
+                if started or idle >= timeout:
+                    raise
+                wait = timeout - idle
+                continue
+            wait = timeout
+
+            if isinstance(msg, BaseException):
+                raise msg
+            started = True
+            if self._handle_message(msg, result, error):
+                return {"error": error, "result": result}
 
     async def create_session_directory(
         self, session_dir: str, created_at: float, last_access: float
@@ -335,11 +779,18 @@ class RemoteJupyterClient:
         :raises JupyterConnectionError: If the Contents API call fails.
         :raises ValueError: If *session_dir* is outside ``self.jupyter_root``.
         """
-        self.create_directory(session_dir)
+        # The REST calls are blocking; run them in a worker thread so the event
+        # loop stays free (e.g. to create the session's kernel concurrently).
+        await asyncio.to_thread(self.create_directory, session_dir)
         metadata = json.dumps(
             {"created_at": created_at, "last_access": last_access}, indent=2
         )
-        self.put_contents(f"{session_dir}/session_meta.json", metadata, format="text")
+        await asyncio.to_thread(
+            self.put_contents,
+            f"{session_dir}/session_meta.json",
+            metadata,
+            format="text",
+        )
 
     async def update_session_metadata(
         self, session_dir: str, created_at: float, last_access: float
@@ -347,7 +798,8 @@ class RemoteJupyterClient:
         """Update session metadata file with new last_access timestamp.
 
         Writes ``session_meta.json`` directly to the session directory via the
-        Contents API without reading the existing file first.
+        Contents API without reading the existing file first.  The request runs
+        in a worker thread so it does not block the event loop.
 
         :param session_dir: Absolute path to the session directory on the remote
             filesystem.
@@ -361,7 +813,9 @@ class RemoteJupyterClient:
         """
         meta_path = f"{session_dir}/session_meta.json"
         metadata = {"created_at": created_at, "last_access": last_access}
-        self.put_contents(meta_path, json.dumps(metadata, indent=2), format="text")
+        await asyncio.to_thread(
+            self.put_contents, meta_path, json.dumps(metadata, indent=2), format="text"
+        )
 
     def get_contents(self, path: str) -> dict[str, Any]:
         """Get directory or file information from Jupyter Contents API.
@@ -372,7 +826,8 @@ class RemoteJupyterClient:
         :type path: str
         :return: Contents API response as dictionary with metadata
         :rtype: dict[str, Any]
-        :raises JupyterConnectionError: If path not found (404) or connection fails
+        :raises JupyterNotFoundError: If path not found (404)
+        :raises JupyterConnectionError: If connection fails
         :raises JupyterAuthError: If permission denied (403)
         :raises ValueError: If *path* is outside ``jupyter_root`` or escapes via
             ``..`` components.
@@ -383,7 +838,7 @@ class RemoteJupyterClient:
             return cast(dict[str, Any], response.json())
         except requests.HTTPError as e:
             if e.response.status_code == 404:
-                raise JupyterConnectionError(f"Path not found: {path}") from e
+                raise JupyterNotFoundError(f"Path not found: {path}") from e
             # 403 is already handled by _make_request as JupyterAuthError
             raise
 
@@ -400,8 +855,8 @@ class RemoteJupyterClient:
         :return: Contents API response dict with at minimum ``format``
             (``"text"`` or ``"base64"``), ``content``, and ``name`` keys.
         :rtype: dict[str, Any]
-        :raises JupyterConnectionError: If the file is not found (404) or
-            the connection fails.
+        :raises JupyterNotFoundError: If the file is not found (404).
+        :raises JupyterConnectionError: If the connection fails.
         :raises JupyterAuthError: If permission is denied (401/403).
         :raises ValueError: If *path* is outside ``jupyter_root`` or escapes via
             ``..`` components.
@@ -411,11 +866,13 @@ class RemoteJupyterClient:
             response = self._make_request(
                 "GET", f"/api/contents/{path}", params={"content": "1", "type": "file"}
             )
-            return cast(dict[str, Any], response.json())
         except requests.HTTPError as e:
             if e.response.status_code == 404:
-                raise JupyterConnectionError(f"File not found: {path}") from e
+                self._record_missing(path, True)
+                raise JupyterNotFoundError(f"File not found: {path}") from e
             raise
+        self._record_missing(path, False)
+        return cast(dict[str, Any], response.json())
 
     def put_contents(
         self, path: str, content: str, format: str = "text"
@@ -444,6 +901,7 @@ class RemoteJupyterClient:
         path = self._resolve_path(path)
         payload = {"type": "file", "format": format, "content": content}
         response = self._make_request("PUT", f"/api/contents/{path}", json=payload)
+        self._record_written(path)
         return cast(dict[str, Any], response.json())
 
     def create_directory(self, path: str) -> None:
@@ -501,8 +959,10 @@ class RemoteJupyterClient:
         path = self._resolve_path(path)
         try:
             self._make_request("GET", f"/api/contents/{path}", params={"content": "0"})
-            return True
         except requests.HTTPError as e:
             if e.response.status_code == 404:
+                self._record_missing(path, True)
                 return False
             raise
+        self._record_missing(path, False)
+        return True
@@ -1,11 +1,15 @@
 import asyncio
 import base64
+import contextlib
+import functools
 import json
 import os
 import posixpath
 import sys
 import time
 import traceback
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -15,6 +19,7 @@ from jupyter_interpreter_mcp.notebook import Notebook
 from jupyter_interpreter_mcp.remote import (
     JupyterAuthError,
     JupyterConnectionError,
+    JupyterExecutionError,
     RemoteJupyterClient,
 )
 from jupyter_interpreter_mcp.session import Session
@@ -24,6 +29,59 @@ remote_client: RemoteJupyterClient = None  # type: ignore
 sessions_dir: str = os.getenv("SESSIONS_DIR", "/home/jovyan/sessions")
 jupyter_root: str = os.getenv("JUPYTER_ROOT", "/home/jovyan")
 session_ttl: float = float(os.getenv("SESSION_TTL", "0"))
+history_flush_interval: float = float(os.getenv("HISTORY_FLUSH_INTERVAL", "1.0"))
+kernel_pool_size: int = int(os.getenv("KERNEL_POOL_SIZE", "0"))
+max_sessions: int = int(os.getenv("MAX_SESSIONS", "32"))
+restore_on_startup: bool = False
+
+# Session metadata filename used by versions before 0.4
+_LEGACY_META_NAME = ".session.json"
+# Maximum time in seconds a session snapshot may delay server shutdown
+_SHUTDOWN_SNAPSHOT_TIMEOUT = 15.0
+
+
+async def _startup_maintenance() -> None:
+    """Eagerly restore sessions and clean up expired ones, if configured.
+
+    Runs on the server's event loop, so kernels and WebSockets opened here
+    stay usable while serving.  Messages go to stderr because stdout carries
+    the stdio transport.
+    """
+    # Optional eager restore (on-demand restore is always active in execute_code)
+    if restore_on_startup:
+        print(f"Restoring sessions from {sessions_dir}...", file=sys.stderr)
+        try:
+            restored = await restore_sessions_from_disk()
+            print(f"Restored {restored} session(s)", file=sys.stderr)
+        except Exception as e:
+            print(f"Warning: Session restoration failed: {e}", file=sys.stderr)
+
+    # Run cleanup of expired sessions
+    if session_ttl > 0:
+        try:
+            cleaned = await cleanup_expired_sessions()
+            if cleaned > 0:
+                print(f"Cleaned up {cleaned} expired session(s)", file=sys.stderr)
+        except Exception as e:
+            print(f"Warning: Session cleanup failed: {e}", file=sys.stderr)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastMCP) -> AsyncIterator[None]:
+    """Server lifespan: restore/clean up sessions and warm the kernel pool on
+    startup, flush queued history and snapshot sessions on exit."""
+    await _startup_maintenance()
+    start_kernel_pool()
+    try:
+        yield
+    finally:
+        await flush_history()
+        await finish_evictions(_SHUTDOWN_SNAPSHOT_TIMEOUT)
+        await snapshot_sessions()
+        await shutdown_kernel_pool()
+        if remote_client is not None:
+            remote_client.close()
+
 
 mcp = FastMCP(
     name="Code Interpreter",
@@ -34,6 +92,7 @@ session_id for that to work.
 
 Supports both Python code and bash commands (e.g., 'ls', 'pwd', 'cat file.txt').
 """,
+    lifespan=_lifespan,
 )
 
 # Session registry: session_id -> Session object
@@ -44,6 +103,276 @@ notebooks: dict[str, Notebook] = {}
 # Locks for thread-safe access to registries
 registry_lock = asyncio.Lock()
 
+# Evicted sessions still being snapshotted: session_id -> task
+_evictions: dict[str, asyncio.Task[None]] = {}
+
+# Background writer persisting session history off the request path
+_history_queue: asyncio.Queue[Notebook] | None = None
+_history_writer: asyncio.Task[None] | None = None
+
+
+async def _history_writer_loop(queue: asyncio.Queue[Notebook]) -> None:
+    """Persist queued notebook histories in the background.
+
+    Repeated entries for the same session collapse into a single write.  A
+    session written less than ``history_flush_interval`` seconds ago is held
+    back until the interval has passed, so bursts of quick cells produce one
+    write per interval while the first write after a quiet period is
+    immediate.  Each session has its own deadline: one that is held back does
+    not delay the writes of other sessions.
+
+    :param queue: Queue of notebooks whose history needs to be saved.
+    :type queue: asyncio.Queue[Notebook]
+    """
+    last_write: dict[str, float] = {}
+    # Sessions waiting to be written, and how many queue entries each covers
+    pending: dict[str, Notebook] = {}
+    received: dict[str, int] = {}
+    # Kept across iterations: cancelling a get() on timeout could lose an entry
+    getter: asyncio.Task[Notebook] | None = None
+
+    def due(session_id: str) -> float:
+        # Time from which the session may be written again
+        written = last_write.get(session_id, -history_flush_interval)
+        return written + history_flush_interval
+
+    try:
+        while True:
+            if getter is None:
+                getter = asyncio.create_task(queue.get())
+            timeout = None
+            if pending:
+                timeout = max(0.0, min(map(due, pending)) - time.monotonic())
+            await asyncio.wait({getter}, timeout=timeout)
+
+            if getter.done():
+                queued = [getter.result()]
+                getter = None
+                while not queue.empty():
+                    queued.append(queue.get_nowait())
+                for notebook in queued:
+                    pending[notebook.session_id] = notebook
+                    received[notebook.session_id] = (
+                        received.get(notebook.session_id, 0) + 1
+                    )
+
+            now = time.monotonic()
+            for session_id in [sid for sid in pending if due(sid) <= now]:
+                notebook = pending.pop(session_id)
+                try:
+                    await notebook.dump_to_file()
+                except Exception as e:
+                    print(
+                        f"Warning: Failed to save history for session "
+                        f"{session_id}: {e}",
+                        file=sys.stderr,
+                    )
+                finally:
+                    for _ in range(received.pop(session_id)):
+                        queue.task_done()
+                last_write[session_id] = time.monotonic()
+
+            now = time.monotonic()
+            last_write = {
+                session_id: written
+                for session_id, written in last_write.items()
+                if now - written < history_flush_interval
+            }
+    finally:
+        if getter is not None:
+            getter.cancel()
+
+
+def schedule_history_flush(notebook: Notebook) -> None:
+    """Queue a notebook for a background history write.
+
+    Starts the writer task on first use (or when the running event loop has
+    changed since it was started).
+
+    :param notebook: Notebook whose history should be saved.
+    :type notebook: Notebook
+    """
+    global _history_queue, _history_writer
+
+    if (
+        _history_queue is None
+        or _history_writer is None
+        or _history_writer.done()
+        or _history_writer.get_loop() is not asyncio.get_running_loop()
+    ):
+        _history_queue = asyncio.Queue()
+        _history_writer = asyncio.create_task(_history_writer_loop(_history_queue))
+    _history_queue.put_nowait(notebook)
+
+
+async def flush_history() -> None:
+    """Wait until all queued history writes have completed."""
+    if (
+        _history_queue is not None
+        and _history_writer is not None
+        and not _history_writer.done()
+        and _history_writer.get_loop() is asyncio.get_running_loop()
+    ):
+        await _history_queue.join()
+
+
+async def snapshot_sessions(timeout: float = _SHUTDOWN_SNAPSHOT_TIMEOUT) -> None:
+    """Snapshot the kernel namespace of every loaded session.
+
+    Lets sessions restored after a restart skip replaying the history that a
+    snapshot already covers.  Failures are reported and do not stop the other
+    sessions from being saved.
+
+    :param timeout: Maximum time in seconds each snapshot may take; kept short
+        since this runs while the server shuts down.
+    :type timeout: float
+    """
+    loaded = list(notebooks.values())
+    results = await asyncio.gather(
+        *(notebook.snapshot(timeout) for notebook in loaded), return_exceptions=True
+    )
+    for notebook, result in zip(loaded, results, strict=True):
+        if isinstance(result, Exception):
+            print(
+                f"Warning: Failed to snapshot session {notebook.session_id}: "
+                f"{result}",
+                file=sys.stderr,
+            )
+
+
+# Moves a kernel into its session directory
+_CHDIR_CODE = """\
+import os
+os.chdir({directory!r})
+"""
+
+# Idle kernels started ahead of time, so new sessions need not wait for startup
+_kernel_pool: list[str] = []
+_kernel_pool_refill: asyncio.Task[None] | None = None
+# Set while the pool shuts down; the refill stops after its current kernel
+_kernel_pool_stopping = False
+
+
+async def _refill_kernel_pool() -> None:
+    """Start kernels until the pool holds ``kernel_pool_size`` of them."""
+    while not _kernel_pool_stopping and len(_kernel_pool) < kernel_pool_size:
+        try:
+            kernel_id = await asyncio.to_thread(remote_client.create_kernel)
+        except Exception as e:
+            print(f"Warning: Failed to start pooled kernel: {e}", file=sys.stderr)
+            return
+        _kernel_pool.append(kernel_id)
+
+
+async def _take_pooled_kernel() -> str | None:
+    """Take a live kernel from the pool.
+
+    Kernels that were culled or died while idle are shut down and skipped.
+
+    :return: ID of a pooled kernel, or None if the pool has no live kernel.
+    :rtype: str | None
+    """
+    while _kernel_pool:
+        kernel_id = _kernel_pool.pop()
+        try:
+            if await asyncio.to_thread(remote_client.is_kernel_alive, kernel_id):
+                return kernel_id
+            reason = "kernel is gone"
+        except Exception as e:
+            reason = str(e)
+        print(
+            f"Warning: Discarding pooled kernel {kernel_id}: {reason}",
+            file=sys.stderr,
+        )
+        with contextlib.suppress(Exception):
+            await asyncio.to_thread(remote_client.shutdown_kernel, kernel_id)
+    return None
+
+
+def start_kernel_pool() -> None:
+    """Start filling the kernel pool in the background.
+
+    Does nothing when ``kernel_pool_size`` is 0 or a refill is already running
+    on the current event loop.
+    """
+    global _kernel_pool_refill
+
+    if kernel_pool_size <= 0 or remote_client is None or _kernel_pool_stopping:
+        return
+    if (
+        _kernel_pool_refill is None
+        or _kernel_pool_refill.done()
+        or _kernel_pool_refill.get_loop() is not asyncio.get_running_loop()
+    ):
+        _kernel_pool_refill = asyncio.create_task(_refill_kernel_pool())
+
+
+async def acquire_kernel() -> str:
+    """Return a running kernel for a new or restored session.
+
+    Takes a pre-started kernel from the pool when one is available and
+    starts a new one otherwise.  Kernels are never handed back to the pool,
+    since a used kernel still holds the previous session's state.
+
+    :return: ID of a running kernel.
+    :rtype: str
+    """
+    kernel_id = await _take_pooled_kernel()
+    if kernel_id is None:
+        kernel_id = await asyncio.to_thread(remote_client.create_kernel)
+    # Only top the pool up once the server has started it
+    if _kernel_pool_refill is not None:
+        start_kernel_pool()
+    return kernel_id
+
+
+async def enter_session_directory(kernel_id: str, session_directory: str) -> None:
+    """Change the working directory of a kernel to its session directory.
+
+    :param kernel_id: ID of the kernel.
+    :type kernel_id: str
+    :param session_directory: Existing directory on the remote filesystem.
+    :type session_directory: str
+    :raises JupyterExecutionError: If the working directory cannot be set.
+    """
+    chdir_code = _CHDIR_CODE.format(directory=session_directory)
+    chdir_result = await remote_client.execute(
+        kernel_id, chdir_code, store_history=False, stop_on_error=False
+    )
+    if chdir_result["error"]:
+        raise JupyterExecutionError(
+            f"Failed to set working directory: {'; '.join(chdir_result['error'])}"
+        )
+
+
+async def shutdown_kernel_pool() -> None:
+    """Stop refilling the kernel pool and shut down the idle kernels in it.
+
+    A kernel being started when this is called is waited for and shut down
+    too; cancelling the refill would leave it running on the server.
+    """
+    global _kernel_pool_refill, _kernel_pool_stopping
+
+    _kernel_pool_stopping = True
+    try:
+        if _kernel_pool_refill is not None:
+            # The refill adds the kernel it is starting, then stops
+            with contextlib.suppress(Exception):
+                await _kernel_pool_refill
+            _kernel_pool_refill = None
+
+        while _kernel_pool:
+            kernel_id = _kernel_pool.pop()
+            try:
+                await asyncio.to_thread(remote_client.shutdown_kernel, kernel_id)
+            except Exception as e:
+                print(
+                    f"Warning: Failed to shutdown pooled kernel {kernel_id}: {e}",
+                    file=sys.stderr,
+                )
+    finally:
+        _kernel_pool_stopping = False
+
 
 async def get_session_and_notebook(session_id: str) -> tuple[Session, Notebook]:
     """Retrieve session and notebook objects while holding the registry lock.
@@ -101,13 +430,132 @@ async def cleanup_expired_sessions() -> int:
                 sessions.pop(session_id, None)
                 notebooks.pop(session_id, None)
 
-                print(f"Cleaned up expired session: {session_id}")
+                print(f"Cleaned up expired session: {session_id}", file=sys.stderr)
             except Exception as e:
                 print(f"Error cleaning up session {session_id}: {e}", file=sys.stderr)
 
         return len(expired_ids)
 
 
+async def evict_idle_sessions(keep: str | None = None) -> int:
+    """Unload the least recently used idle sessions beyond ``max_sessions``.
+
+    The history of each evicted session is saved along with a snapshot of its
+    kernel namespace, and its kernel shut down.  Its directory stays on disk,
+    so the session is restored on demand when it is used again.
+
+    :param keep: Optional session ID that must not be evicted (e.g. the
+        session that was just added).
+    :type keep: str | None
+    :return: Number of sessions evicted.
+    :rtype: int
+    """
+    global sessions, notebooks, remote_client, max_sessions
+
+    if max_sessions <= 0:
+        return 0  # No limit
+
+    async with registry_lock:
+        excess = len(sessions) - max_sessions
+        if excess <= 0:
+            return 0
+        # last_access is only updated once an execution returns, so a session
+        # running a long cell looks idle; never shut such a kernel down
+        candidates = sorted(
+            (
+                session
+                for sid, session in sessions.items()
+                if sid != keep and not (sid in notebooks and notebooks[sid].is_busy)
+            ),
+            key=lambda session: session.last_access,
+        )
+        evicted = [
+            (sessions.pop(session.id), notebooks.pop(session.id, None))
+            for session in candidates[:excess]
+        ]
+
+    # Save the history outside the lock (a quick write), but snapshot and shut
+    # down the kernel in the background: a snapshot can take minutes and
+    # would hold up the request that triggered the eviction
+    for session, notebook in evicted:
+        if notebook is not None:
+            try:
+                await notebook.dump_to_file()
+            except Exception as e:
+                print(
+                    f"Warning: Failed to save history for session {session.id}: {e}",
+                    file=sys.stderr,
+                )
+        task = asyncio.create_task(_unload_session(session, notebook))
+        _evictions[session.id] = task
+        task.add_done_callback(functools.partial(_forget_eviction, session.id))
+
+    return len(evicted)
+
+
+async def _unload_session(session: Session, notebook: Notebook | None) -> None:
+    """Snapshot an evicted session and shut down its kernel.
+
+    The kernel is shut down even when the snapshot fails or is cancelled.
+
+    :param session: The evicted session.
+    :type session: Session
+    :param notebook: The session's notebook, if it was loaded.
+    :type notebook: Notebook | None
+    """
+    try:
+        if notebook is not None:
+            try:
+                await notebook.snapshot()
+            except Exception as e:
+                print(
+                    f"Warning: Failed to snapshot session {session.id}: {e}",
+                    file=sys.stderr,
+                )
+    finally:
+        try:
+            # The WebSocket can only be closed on the loop, not in the thread
+            await remote_client.close_kernel_connection(session.kernel_id)
+            await asyncio.to_thread(remote_client.shutdown_kernel, session.kernel_id)
+        except Exception as e:
+            print(
+                f"Warning: Failed to shutdown kernel for session {session.id}: {e}",
+                file=sys.stderr,
+            )
+        print(f"Evicted idle session: {session.id}", file=sys.stderr)
+
+
+def _forget_eviction(session_id: str, task: asyncio.Task[None]) -> None:
+    """Drop a finished eviction task, unless a newer one replaced it.
+
+    :param session_id: ID of the evicted session.
+    :type session_id: str
+    :param task: The finished eviction task.
+    :type task: asyncio.Task[None]
+    """
+    if _evictions.get(session_id) is task:
+        del _evictions[session_id]
+
+
+async def finish_evictions(timeout: float | None = None) -> None:
+    """Wait for background evictions to snapshot their sessions.
+
+    Evictions still running after *timeout* seconds are cancelled, which
+    skips their snapshot but still shuts their kernel down.
+
+    :param timeout: Optional maximum time in seconds to wait.
+    :type timeout: float | None
+    """
+    pending = set(_evictions.values())
+    if not pending:
+        return
+    _, unfinished = await asyncio.wait(pending, timeout=timeout)
+    for task in unfinished:
+        task.cancel()
+    if unfinished:
+        await asyncio.wait(unfinished)
+
+
 async def restore_sessions_from_disk(target_session_id: str | None = None) -> int:
     """Restore existing sessions from disk on server startup.
 
@@ -123,6 +571,11 @@ async def restore_sessions_from_disk(target_session_id: str | None = None) -> in
     """
     global sessions, notebooks, remote_client, sessions_dir, jupyter_root, session_ttl
 
+    # A session evicted moments ago may still be writing its snapshot
+    eviction = _evictions.get(target_session_id) if target_session_id else None
+    if eviction is not None:
+        await asyncio.wait({eviction})
+
     # List session directories via the Contents API. get_contents accepts
     # absolute paths and validates that the path is within jupyter_root,
     # raising ValueError if not.
@@ -155,24 +608,13 @@ async def restore_sessions_from_disk(target_session_id: str | None = None) -> in
             # Primary attempt: use the current metadata filename.
             meta_contents = remote_client.get_file_contents(meta_api_path)
         except JupyterConnectionError:
-            # Backward-compatible fallback: look for any legacy JSON metadata file
-            # in the session directory (from previous versions that used a different
-            # metadata filename).
+            # Backward-compatible fallback: versions before 0.4 kept the
+            # metadata in a hidden file.  Only that name is tried, since the
+            # session directory holds other JSON files (e.g. the memoize cache).
             try:
-                session_dir_contents = remote_client.get_contents(session_abs_dir)
-                legacy_meta_name: str | None = None
-                for item in session_dir_contents.get("content", []):
-                    if item.get("type") == "file" and item.get("name", "").endswith(
-                        ".json"
-                    ):
-                        legacy_meta_name = item["name"]
-                        break
-                if legacy_meta_name is None:
-                    raise JupyterConnectionError(
-                        f"No metadata JSON file found for session {name}"
-                    )
-                legacy_meta_api_path = posixpath.join(session_abs_dir, legacy_meta_name)
-                meta_contents = remote_client.get_file_contents(legacy_meta_api_path)
+                meta_contents = remote_client.get_file_contents(
+                    posixpath.join(session_abs_dir, _LEGACY_META_NAME)
+                )
             except Exception as e:
                 print(
                     f"Skipping {name}: could not read legacy session metadata ({e})",
@@ -196,6 +638,13 @@ async def restore_sessions_from_disk(target_session_id: str | None = None) -> in
             )
             continue
 
+    # Restoring more sessions than can be kept would only evict them again
+    if target_session_id is None and max_sessions > 0:
+        sessions_to_restore.sort(
+            key=lambda meta: meta["last_access"] or 0, reverse=True
+        )
+        del sessions_to_restore[max_sessions:]
+
     restored_count = 0
 
     for meta in sessions_to_restore:
@@ -210,29 +659,25 @@ async def restore_sessions_from_disk(target_session_id: str | None = None) -> in
                 continue
 
         if created_at is None or last_access is None:
-            print(f"Skipping {session_id}: invalid metadata")
+            print(f"Skipping {session_id}: invalid metadata", file=sys.stderr)
             continue
 
         # Check if session is expired
         if session_ttl > 0:
             age = time.time() - last_access
             if age > session_ttl:
-                print(f"Skipping {session_id}: expired ({age:.0f}s old)")
+                print(
+                    f"Skipping {session_id}: expired ({age:.0f}s old)", file=sys.stderr
+                )
                 continue
 
         try:
-            # Create kernel for restored session
-            kernel_id = remote_client.create_kernel()
-
-            # Change working directory
-            chdir_code = f"import os\nos.chdir({repr(session_directory)})"
-            chdir_result = await remote_client.execute(kernel_id, chdir_code)
-            if chdir_result["error"]:
-                print(
-                    f"Warning: Failed to set working directory for {session_id}: "
-                    f"{'; '.join(chdir_result['error'])}",
-                    file=sys.stderr,
-                )
+            # Create kernel for restored session, running in its directory
+            kernel_id = await acquire_kernel()
+            try:
+                await enter_session_directory(kernel_id, session_directory)
+            except JupyterExecutionError as e:
+                print(f"Warning: {e} for {session_id}", file=sys.stderr)
                 remote_client.shutdown_kernel(kernel_id)
                 continue
 
@@ -264,16 +709,22 @@ async def restore_sessions_from_disk(target_session_id: str | None = None) -> in
                 if session_id not in sessions:
                     sessions[session_id] = session
                     notebooks[session_id] = notebook
-                    print(f"Restored session: {session_id}")
+                    print(f"Restored session: {session_id}", file=sys.stderr)
                     restored_count += 1
                 else:
-                    print(f"Session {session_id} already restored by another task")
+                    print(
+                        f"Session {session_id} already restored by another task",
+                        file=sys.stderr,
+                    )
                     remote_client.shutdown_kernel(kernel_id)
 
         except Exception as e:
             print(f"Error restoring session {session_id}: {e}", file=sys.stderr)
             continue
 
+    if restored_count:
+        await evict_idle_sessions(keep=target_session_id)
+
     return restored_count
 
 
@@ -367,27 +818,24 @@ async def create_session() -> dict[str, str]:
         # Generate session ID
         session_id = generate_session_id()
 
-        # Create kernel
-        kernel_id = remote_client.create_kernel()
-
-        # Create session directory
+        # Get a kernel and create the session directory concurrently; they
+        # are independent REST calls.
         current_time = time.time()
         session_directory = os.path.join(sessions_dir, session_id)
-        await remote_client.create_session_directory(
-            session_directory, current_time, current_time
+        kernel_outcome, directory_outcome = await asyncio.gather(
+            acquire_kernel(),
+            remote_client.create_session_directory(
+                session_directory, current_time, current_time
+            ),
+            return_exceptions=True,
         )
+        if isinstance(kernel_outcome, BaseException):
+            raise kernel_outcome
+        kernel_id = kernel_outcome
+        if isinstance(directory_outcome, BaseException):
+            raise directory_outcome
 
-        # Change kernel working directory to session directory
-        chdir_code = f"""
-import os
-os.chdir({repr(session_directory)})
-print(f"Working directory: {{os.getcwd()}}")
-"""
-        chdir_result = await remote_client.execute(kernel_id, chdir_code)
-        if chdir_result["error"]:
-            raise Exception(
-                f"Failed to set working directory: {'; '.join(chdir_result['error'])}"
-            )
+        await enter_session_directory(kernel_id, session_directory)
 
         # Create session object
         session = Session(
@@ -406,6 +854,8 @@ print(f"Working directory: {{os.getcwd()}}")
             sessions[session_id] = session
             notebooks[session_id] = notebook
 
+        await evict_idle_sessions(keep=session_id)
+
         return {"session_id": session_id}
     except Exception as e:
         # Clean up kernel if it was created
@@ -469,7 +919,7 @@ async def execute_code(code: str, session_id: str) -> dict[str, list[str] | str]
         }
 
         if len(result["error"]) == 0:
-            asyncio.create_task(notebook.dump_to_file())
+            schedule_history_flush(notebook)
 
         return response
     except ValueError as e:
@@ -1169,6 +1619,34 @@ def main() -> None:
         default=float(os.getenv("SESSION_TTL", "0")),
         help="Session time-to-live in seconds (0 = no expiry, default: %(default)s)",
     )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=int(os.getenv("MAX_SESSIONS", "32")),
+        help=(
+            "Maximum number of sessions kept loaded; the least recently used "
+            "are unloaded and restored on demand (0 = no limit, "
+            "default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--history-flush-interval",
+        type=float,
+        default=float(os.getenv("HISTORY_FLUSH_INTERVAL", "1.0")),
+        help=(
+            "Minimum seconds between history file writes for a session; writes "
+            "within the interval are coalesced (default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--kernel-pool-size",
+        type=int,
+        default=int(os.getenv("KERNEL_POOL_SIZE", "0")),
+        help=(
+            "Number of idle kernels to keep started for new sessions "
+            "(0 = start kernels on demand, default: %(default)s)"
+        ),
+    )
     parser.add_argument(
         "--restore-sessions-on-startup",
         action="store_true",
@@ -1234,6 +1712,8 @@ def main() -> None:
 
     # Initialize remote client
     global remote_client, sessions_dir, jupyter_root, session_ttl
+    global history_flush_interval, kernel_pool_size, max_sessions
+    global restore_on_startup
     try:
         if not token:
             raise ValueError(
@@ -1246,6 +1726,9 @@ def main() -> None:
         sessions_dir = sessions_dir_path
         jupyter_root = jupyter_root_path
         session_ttl = ttl
+        history_flush_interval = args.history_flush_interval
+        kernel_pool_size = args.kernel_pool_size
+        max_sessions = args.max_sessions
         # Validate connection on startup
         remote_client.validate_connection()
         print(f"Connected to Jupyter server at {base_url}")
@@ -1262,28 +1745,10 @@ def main() -> None:
         print(f"Invalid configuration: {e}", file=sys.stderr)
         sys.exit(1)
 
-    import asyncio
-
-    # Optional eager restore (on-demand restore is always active in execute_code)
-    if args.restore_sessions_on_startup:
-        print(f"Restoring sessions from {sessions_dir}...")
-        try:
-            restored = asyncio.run(restore_sessions_from_disk())
-            print(f"Restored {restored} session(s)")
-        except Exception as e:
-            print(f"Warning: Session restoration failed: {e}", file=sys.stderr)
-    else:
+    restore_on_startup = args.restore_sessions_on_startup
+    if not restore_on_startup:
         print("Skipping eager startup restore (using on-demand session restore)")
 
-    # Run cleanup of expired sessions
-    if session_ttl > 0:
-        try:
-            cleaned = asyncio.run(cleanup_expired_sessions())
-            if cleaned > 0:
-                print(f"Cleaned up {cleaned} expired session(s)")
-        except Exception as e:
-            print(f"Warning: Session cleanup failed: {e}", file=sys.stderr)
-
     mcp.run()
 
 
@@ -0,0 +1,21 @@
+"""Shared fixtures for the unit tests."""
+
+from unittest.mock import create_autospec
+
+import pytest
+
+from jupyter_interpreter_mcp.remote import RemoteJupyterClient
+
+# Autospecced once at import; the fixture resets it for each test
+_REMOTE_TEMPLATE = create_autospec(RemoteJupyterClient, instance=True)
+
+
+@pytest.fixture
+def mock_remote_client():
+    """Return the mock RemoteJupyterClient, reset for this test."""
+    client = _REMOTE_TEMPLATE
+    client.reset_mock(return_value=True, side_effect=True)
+    client.create_kernel.return_value = "kernel-123"
+    client.known_missing.return_value = False
+    client.execute.return_value = {"error": [], "result": []}
+    return client
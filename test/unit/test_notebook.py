@@ -1,26 +1,52 @@
 """Unit tests for Notebook class."""
 
-from unittest.mock import AsyncMock, Mock
+import json
+from unittest.mock import call
 
 import pytest
 
-from jupyter_interpreter_mcp.notebook import Notebook
-from jupyter_interpreter_mcp.remote import RemoteJupyterClient
+from jupyter_interpreter_mcp.notebook import (
+    _APPEND_HISTORY_CODE,
+    Notebook,
+    _cache_key,
+    _history_digest,
+)
+from jupyter_interpreter_mcp.remote import (
+    JupyterConnectionError,
+    JupyterNotFoundError,
+)
+
+
+def _history_without_snapshot(path):
+    """get_file_contents side effect for a saved history with no snapshot."""
+    if path.endswith("history.txt"):
+        return {"content": "x = 10\n"}
+    raise JupyterNotFoundError("File not found")
+
+
+def _snapshot_meta(history, offset):
+    """Snapshot metadata covering the first *offset* bytes of *history*."""
+    covered = history.encode("utf-8")[:offset]
+    return json.dumps(
+        {"history_offset": offset, "history_digest": _history_digest(covered)}
+    )
 
 
 @pytest.fixture
-def mock_remote_client():
-    """Create a mock RemoteJupyterClient for testing."""
-    client = Mock(spec=RemoteJupyterClient)
-    client.create_kernel.return_value = "kernel-123"
-    client.execute = AsyncMock(return_value={"error": [], "result": []})
-    return client
+async def notebook(mock_remote_client):
+    """Create a notebook connected to the mock RemoteJupyterClient."""
+    notebook = Notebook(
+        session_id="test-session-1",
+        remote_client=mock_remote_client,
+        session_directory="/home/jovyan/sessions/test-session-1",
+    )
+    await notebook.connect()
+    return notebook
 
 
 class TestNotebookInit:
     """Test Notebook initialization."""
 
-    @pytest.mark.asyncio
     async def test_init_success(self, mock_remote_client):
         """Test successful notebook initialization."""
         notebook = Notebook(
@@ -45,94 +71,156 @@ class TestNotebookInit:
 class TestExecuteNewCode:
     """Test code execution."""
 
-    @pytest.mark.asyncio
-    async def test_execute_new_code_success(self, mock_remote_client):
-        """Test successful code execution."""
-        notebook = Notebook(
-            session_id="test-session-1",
-            remote_client=mock_remote_client,
-            session_directory="/home/jovyan/sessions/test-session-1",
-        )
-        await notebook.connect()
-
-        # Mock execute to return stream output
-        mock_remote_client.execute.return_value = {
-            "error": [],
-            "result": ["Hello, World!\n"],
-        }
-
-        result = await notebook.execute_new_code("print('Hello, World!')")
-
-        assert result["error"] == []
-        assert result["result"] == ["Hello, World!\n"]
+    @pytest.mark.parametrize(
+        "code, output, history",
+        [
+            (
+                "print('Hello, World!')",
+                {"error": [], "result": ["Hello, World!\n"]},
+                ["\nprint('Hello, World!')"],
+            ),
+            (
+                "21 + 21",
+                {"error": [], "result": ["Execution Result: 42"]},
+                ["\n21 + 21"],
+            ),
+            # History should not be updated on error
+            (
+                "print(x)",
+                {"error": ["Error: NameError: name 'x' is not defined"], "result": []},
+                [],
+            ),
+        ],
+        ids=["stream", "execute_result", "error"],
+    )
+    async def test_execute_new_code(
+        self, notebook, mock_remote_client, code, output, history
+    ):
+        """Test successful code is added to the history, failed code is not."""
+        mock_remote_client.execute.return_value = output
+
+        result = await notebook.execute_new_code(code)
+
+        assert result["error"] == output["error"]
+        assert result["result"] == output["result"]
+        assert notebook.history == history
+        # The bytes written to the history file match the recorded blocks
+        assert notebook._history_bytes == "".join(
+            block + "\n" for block in history
+        ).encode("utf-8")
+        mock_remote_client.execute.assert_called_once_with("kernel-123", code)
+
+    async def test_execute_new_code_marks_notebook_busy(
+        self, notebook, mock_remote_client
+    ):
+        """Test the notebook reports running code until execute returns."""
+        busy_during_execute = []
+
+        async def execute(kernel_id, code):
+            busy_during_execute.append(notebook.is_busy)
+            return {"error": [], "result": []}
+
+        mock_remote_client.execute.side_effect = execute
+
+        assert notebook.is_busy is False
+        await notebook.execute_new_code("x = 1")
+
+        assert busy_during_execute == [True]
+        assert notebook.is_busy is False
+
+    async def test_execute_new_code_busy_while_reading_cache(
+        self, notebook, mock_remote_client
+    ):
+        """Test memoized code counts as running while its cache is read."""
+        busy_during_read = []
+
+        def get_file_contents(path):
+            busy_during_read.append(notebook.is_busy)
+            raise JupyterNotFoundError("File not found")
+
+        mock_remote_client.get_file_contents.side_effect = get_file_contents
+
+        await notebook.execute_new_code("# @memoize\nx = 1")
+
+        assert busy_during_read == [True]
+        assert notebook.is_busy is False
+
+    async def test_execute_new_code_memoized(self, notebook, mock_remote_client):
+        """Test marked code is executed once and then served from the cache."""
+        mock_remote_client.get_file_contents.side_effect = Exception("Not found")
+        mock_remote_client.execute.return_value = {"error": [], "result": ["3\n"]}
+
+        code = "# @memoize\nprint(1 + 2)"
+        first = await notebook.execute_new_code(code)
+        second = await notebook.execute_new_code(code)
+
+        assert first == second == {"error": [], "result": ["3\n"]}
+        mock_remote_client.execute.assert_called_once_with("kernel-123", code)
         assert len(notebook.history) == 1
-        assert "\nprint('Hello, World!')" in notebook.history[0]
 
-        # Verify execute was called with correct parameters
-        mock_remote_client.execute.assert_called_once_with(
-            "kernel-123", "print('Hello, World!')"
+        # Unmarked code is always executed
+        await notebook.execute_new_code("print(1 + 2)")
+        await notebook.execute_new_code("print(1 + 2)")
+        assert mock_remote_client.execute.call_count == 3
+
+    async def test_execute_new_code_memoized_from_file(
+        self, notebook, mock_remote_client
+    ):
+        """Test memoized outputs saved by a previous run are reused."""
+        code = "# @memoize\nprint(1 + 2)"
+        mock_remote_client.execute.return_value = {"error": [], "result": ["3\n"]}
+        await notebook.execute_new_code(code)
+        await notebook.dump_to_file()
+
+        mock_remote_client.put_contents.assert_called_with(
+            "/home/jovyan/sessions/test-session-1/history.cache.json",
+            json.dumps({_cache_key(code): {"error": [], "result": ["3\n"]}}),
+            format="text",
         )
+        saved = mock_remote_client.put_contents.call_args[0][1]
 
-    @pytest.mark.asyncio
-    async def test_execute_new_code_with_result(self, mock_remote_client):
-        """Test code execution with execute_result."""
-        notebook = Notebook(
+        restarted = Notebook(
             session_id="test-session-1",
             remote_client=mock_remote_client,
             session_directory="/home/jovyan/sessions/test-session-1",
         )
-        await notebook.connect()
+        await restarted.connect()
+        mock_remote_client.execute.reset_mock()
+        mock_remote_client.get_file_contents.reset_mock()
+        mock_remote_client.get_file_contents.return_value = {"content": saved}
 
-        # Mock execute with execute_result
-        mock_remote_client.execute.return_value = {
-            "error": [],
-            "result": ["Execution Result: 42"],
-        }
-
-        result = await notebook.execute_new_code("21 + 21")
+        result = await restarted.execute_new_code(code)
 
-        assert result["error"] == []
-        assert "Execution Result: 42" in result["result"]
-        assert len(notebook.history) == 1
-
-    @pytest.mark.asyncio
-    async def test_execute_new_code_with_error(self, mock_remote_client):
-        """Test code execution with error."""
-        notebook = Notebook(
-            session_id="test-session-1",
-            remote_client=mock_remote_client,
-            session_directory="/home/jovyan/sessions/test-session-1",
+        assert result == {"error": [], "result": ["3\n"]}
+        mock_remote_client.execute.assert_not_called()
+        mock_remote_client.get_file_contents.assert_called_once_with(
+            "/home/jovyan/sessions/test-session-1/history.cache.json"
         )
-        await notebook.connect()
 
-        # Mock execute with error
+    async def test_execute_new_code_memoized_error_not_cached(
+        self, notebook, mock_remote_client
+    ):
+        """Test failed executions of marked code are not cached."""
+        mock_remote_client.get_file_contents.side_effect = Exception("Not found")
         mock_remote_client.execute.return_value = {
             "error": ["Error: NameError: name 'x' is not defined"],
             "result": [],
         }
 
-        result = await notebook.execute_new_code("print(x)")
+        code = "# @memoize\nprint(x)"
+        await notebook.execute_new_code(code)
+        await notebook.execute_new_code(code)
 
-        assert "Error: NameError: name 'x' is not defined" in result["error"]
-        assert result["result"] == []
-        # History should not be updated on error
-        assert len(notebook.history) == 0
+        assert mock_remote_client.execute.call_count == 2
 
 
 class TestDumpToFile:
     """Test dumping history to file."""
 
-    @pytest.mark.asyncio
-    async def test_dump_to_file(self, mock_remote_client):
+    async def test_dump_to_file(self, notebook, mock_remote_client):
         """Test dumping history to remote file."""
-        notebook = Notebook(
-            session_id="test-session-1",
-            remote_client=mock_remote_client,
-            session_directory="/home/jovyan/sessions/test-session-1",
-        )
-        await notebook.connect()
-
-        notebook.history = ["\nprint('test1')", "\nprint('test2')"]
+        await notebook.execute_new_code("print('test1')")
+        await notebook.execute_new_code("print('test2')")
 
         await notebook.dump_to_file()
 
@@ -145,116 +233,331 @@ class TestDumpToFile:
         assert "\nprint('test1')" in content
         assert "\nprint('test2')" in content
 
-    @pytest.mark.asyncio
-    async def test_dump_to_file_empty_history(self, mock_remote_client):
-        """Test dumping empty history to file."""
-        notebook = Notebook(
-            session_id="test-session-1",
-            remote_client=mock_remote_client,
-            session_directory="/home/jovyan/sessions/test-session-1",
-        )
-        await notebook.connect()
-
+    async def test_dump_to_file_empty_history(self, notebook, mock_remote_client):
+        """Test dumping empty history does not write the file."""
         # History is empty by default
         await notebook.dump_to_file()
 
-        # Should still call put_contents (even for empty history)
+        mock_remote_client.put_contents.assert_not_called()
+
+    async def test_dump_to_file_skips_when_already_flushed(
+        self, notebook, mock_remote_client
+    ):
+        """Test a second dump without new code does not rewrite the file."""
+        await notebook.execute_new_code("x = 1")
+        await notebook.dump_to_file()
+        await notebook.dump_to_file()
+
         mock_remote_client.put_contents.assert_called_once()
 
+    async def test_dump_to_file_retries_after_failure(
+        self, notebook, mock_remote_client
+    ):
+        """Test pending code is kept when the write fails."""
+        await notebook.execute_new_code("x = 1")
+        mock_remote_client.put_contents.side_effect = Exception("Write failed")
+        with pytest.raises(Exception, match="Write failed"):
+            await notebook.dump_to_file()
 
-class TestLoadFromFile:
-    """Test loading history from file."""
+        mock_remote_client.put_contents.side_effect = None
+        await notebook.dump_to_file()
 
-    @pytest.mark.asyncio
-    async def test_load_from_file_success(self, mock_remote_client):
-        """Test successfully loading history from file."""
-        notebook = Notebook(
-            session_id="test-session-1",
-            remote_client=mock_remote_client,
-            session_directory="/home/jovyan/sessions/test-session-1",
+        assert mock_remote_client.put_contents.call_count == 2
+
+    async def test_dump_to_file_appends_only_new_code(
+        self, notebook, mock_remote_client
+    ):
+        """Test later dumps append the new code in the kernel."""
+        await notebook.execute_new_code("x = 1")
+        await notebook.dump_to_file()
+        await notebook.execute_new_code("y = 2")
+        mock_remote_client.execute.reset_mock()
+
+        await notebook.dump_to_file()
+
+        # Only the first dump rewrites the whole file
+        mock_remote_client.put_contents.assert_called_once()
+        mock_remote_client.execute.assert_called_once()
+        kernel_id, code = mock_remote_client.execute.call_args[0]
+        assert kernel_id == "kernel-123"
+        assert mock_remote_client.execute.call_args[1] == {
+            "store_history": False,
+            "stop_on_error": False,
+        }
+        assert repr(b"\ny = 2\n") in code
+        assert "x = 1" not in code
+
+    async def test_dump_to_file_keeps_code_run_during_append(
+        self, notebook, mock_remote_client
+    ):
+        """Test code executed while an append is in flight is written next time."""
+
+        await notebook.execute_new_code("x = 1")
+        await notebook.dump_to_file()
+        await notebook.execute_new_code("y = 2")
+
+        async def execute_during_append(kernel_id, code, **kwargs):
+            if kwargs.get("store_history") is False:
+                # The user runs another cell while the append is pending
+                await notebook.execute_new_code("z = 3")
+            return {"error": [], "result": []}
+
+        mock_remote_client.execute.side_effect = execute_during_append
+        await notebook.dump_to_file()
+        mock_remote_client.execute.side_effect = None
+        mock_remote_client.execute.reset_mock()
+
+        await notebook.dump_to_file()
+
+        code = mock_remote_client.execute.call_args[0][1]
+        assert repr(b"\nz = 3\n") in code
+        assert "y = 2" not in code
+
+    async def test_dump_to_file_rewrites_when_append_fails(
+        self, notebook, mock_remote_client
+    ):
+        """Test a failed in-kernel append falls back to a full rewrite."""
+        await notebook.execute_new_code("x = 1")
+        await notebook.dump_to_file()
+        await notebook.execute_new_code("y = 2")
+        mock_remote_client.execute.return_value = {
+            "error": ["Error: RuntimeError: history file changed since last write"],
+            "result": [],
+        }
+
+        await notebook.dump_to_file()
+
+        assert mock_remote_client.put_contents.call_count == 2
+        content = mock_remote_client.put_contents.call_args[0][1]
+        assert content == "\nx = 1\n\ny = 2\n"
+
+    async def test_dump_to_file_keeps_history_created_after_load(
+        self, notebook, mock_remote_client
+    ):
+        """Test a history file that appeared after a fresh load is kept."""
+        mock_remote_client.known_missing.return_value = True
+        await notebook.load_from_file()
+        await notebook.execute_new_code("y = 2")
+        mock_remote_client.execute.return_value = {
+            "error": ["Error: RuntimeError: history file changed since last write"],
+            "result": [],
+        }
+        mock_remote_client.get_file_contents.return_value = {"content": "\nx = 1\n"}
+
+        await notebook.dump_to_file()
+
+        content = mock_remote_client.put_contents.call_args[0][1]
+        assert content == "\nx = 1\n\ny = 2\n"
+
+    async def test_concurrent_dumps_write_history_once(
+        self, notebook, mock_remote_client
+    ):
+        """Test overlapping dumps do not both rewrite the history file."""
+        import asyncio
+
+        mock_remote_client.known_missing.return_value = True
+        await notebook.load_from_file()
+        await notebook.execute_new_code("y = 2")
+        mock_remote_client.execute.return_value = {
+            "error": ["Error: RuntimeError: history file changed since last write"],
+            "result": [],
+        }
+        mock_remote_client.get_file_contents.return_value = {"content": "\nx = 1\n"}
+
+        await asyncio.gather(notebook.dump_to_file(), notebook.dump_to_file())
+
+        mock_remote_client.put_contents.assert_called_once()
+        content = mock_remote_client.put_contents.call_args[0][1]
+        assert content == "\nx = 1\n\ny = 2\n"
+
+
+class TestAppendHistoryCode:
+    """Test the history append code run inside the kernel."""
+
+    def test_appends_and_cleans_up(self, tmp_path):
+        """Test the data is appended and no helper is left behind."""
+        history = tmp_path / "history.txt"
+        history.write_bytes(b"\nx = 1\n")
+        namespace = {"open": None}  # shadowed by user code
+
+        exec(
+            _APPEND_HISTORY_CODE.format(
+                path=str(history), data=b"\ny = 2\n", expected_size=7
+            ),
+            namespace,
         )
-        await notebook.connect()
 
-        # Mock get_file_contents to return file content, and execute for re-execution
-        mock_remote_client.get_file_contents.return_value = {"content": "x = 10\n"}
-        mock_remote_client.execute.return_value = {"error": [], "result": []}
+        assert history.read_bytes() == b"\nx = 1\n\ny = 2\n"
+        assert set(namespace) == {"open", "__builtins__"}
+
+    def test_size_mismatch_cleans_up(self, tmp_path):
+        """Test a stale append is skipped without leaving the helper behind."""
+        history = tmp_path / "history.txt"
+        history.write_bytes(b"\nx = 1\n\nz = 3\n")
+        namespace = {}
+
+        with pytest.raises(RuntimeError, match="history file changed"):
+            exec(
+                _APPEND_HISTORY_CODE.format(
+                    path=str(history), data=b"\ny = 2\n", expected_size=7
+                ),
+                namespace,
+            )
+
+        assert history.read_bytes() == b"\nx = 1\n\nz = 3\n"
+        assert set(namespace) == {"__builtins__"}
+
+
+class TestLoadFromFile:
+    """Test loading history from file."""
+
+    @pytest.mark.parametrize(
+        "side_effect, expected, history",
+        [
+            (_history_without_snapshot, True, ["x = 10"]),
+            # File does not exist → fresh session
+            (JupyterNotFoundError("File not found"), True, []),
+            # A connection failure is not mistaken for a missing file
+            (JupyterConnectionError("Cannot connect"), False, []),
+            (Exception("Error: OSError: Cannot read file"), False, []),
+            (Exception("Unexpected error"), False, []),
+        ],
+        ids=["success", "not_found", "connection_error", "read_error", "exception"],
+    )
+    async def test_load_from_file(
+        self, notebook, mock_remote_client, side_effect, expected, history
+    ):
+        """Test loading history from file."""
+        mock_remote_client.get_file_contents.side_effect = side_effect
 
         result = await notebook.load_from_file()
 
-        assert result is True
-        # Should call execute once to re-execute the restored content
-        assert mock_remote_client.execute.call_count == 1
-        # Restored history should contain only restored user code
-        assert notebook.history == ["x = 10"]
-
-    @pytest.mark.asyncio
-    async def test_load_from_file_not_found(self, mock_remote_client):
-        """Test loading from non-existent file."""
-        notebook = Notebook(
-            session_id="test-session-1",
-            remote_client=mock_remote_client,
-            session_directory="/home/jovyan/sessions/test-session-1",
-        )
-        await notebook.connect()
+        assert result is expected
+        # Restored history should contain only restored user code, which is
+        # re-executed once
+        assert notebook.history == history
+        assert mock_remote_client.execute.call_count == len(history)
+
+    async def test_load_from_file_reads_history_once(
+        self, notebook, mock_remote_client
+    ):
+        """Test the history is fetched with a single request."""
+        mock_remote_client.get_file_contents.side_effect = _history_without_snapshot
+
+        await notebook.load_from_file()
+
+        assert mock_remote_client.get_file_contents.call_args_list == [
+            call("/home/jovyan/sessions/test-session-1/history.txt"),
+            call("/home/jovyan/sessions/test-session-1/session.pkl.json"),
+        ]
+        mock_remote_client.check_exists.assert_not_called()
 
-        # Mock check_exists to return False (file does not exist → fresh session)
-        mock_remote_client.check_exists.return_value = False
+    async def test_load_from_file_skips_known_missing_history(
+        self, notebook, mock_remote_client
+    ):
+        """Test no request is made for a history file known to be missing."""
+        mock_remote_client.known_missing.return_value = True
 
         result = await notebook.load_from_file()
 
         assert result is True
         assert notebook.history == []
+        mock_remote_client.get_file_contents.assert_not_called()
+        mock_remote_client.execute.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_load_from_file_with_error(self, mock_remote_client):
-        """Test loading from file with execution error."""
-        notebook = Notebook(
-            session_id="test-session-1",
-            remote_client=mock_remote_client,
-            session_directory="/home/jovyan/sessions/test-session-1",
-        )
-        await notebook.connect()
 
-        # Mock get_file_contents to raise a generic exception (read error)
-        mock_remote_client.get_file_contents.side_effect = Exception(
-            "Error: OSError: Cannot read file"
-        )
+class TestSnapshot:
+    """Test kernel namespace snapshots."""
+
+    async def test_snapshot_saves_namespace_after_history(
+        self, notebook, mock_remote_client
+    ):
+        """Test a snapshot records how much of the history it covers."""
+        await notebook.execute_new_code("x = 1")
+
+        assert await notebook.snapshot() is True
+
+        # The history is written before the snapshot is taken
+        mock_remote_client.put_contents.assert_called_once()
+        code = mock_remote_client.execute.call_args[0][1]
+        compile(code, "<snapshot>", "exec")
+        assert "/home/jovyan/sessions/test-session-1/session.pkl" in code
+        assert repr(_snapshot_meta("\nx = 1\n", len(b"\nx = 1\n"))) in code
+        # IPython's own globals are not saved over the restored kernel's
+        assert "'get_ipython'" in code
+        assert mock_remote_client.execute.call_args[1]["store_history"] is False
+
+    async def test_snapshot_failure(self, notebook, mock_remote_client):
+        """Test a kernel that cannot take snapshots is reported, not raised."""
+        mock_remote_client.execute.return_value = {
+            "error": ["Error: ModuleNotFoundError: No module named 'dill'"],
+            "result": [],
+        }
+
+        assert await notebook.snapshot() is False
+
+    async def test_load_from_file_replays_only_code_after_snapshot(
+        self, notebook, mock_remote_client
+    ):
+        """Test a restore loads the snapshot and replays the rest."""
+        history = "\nx = 1\n\ny = 2\n"
+        meta = _snapshot_meta(history, len("\nx = 1\n"))
+        mock_remote_client.get_file_contents.side_effect = lambda path: {
+            "content": history if path.endswith("history.txt") else meta
+        }
 
         result = await notebook.load_from_file()
 
-        assert result is False
+        assert result is True
+        load_call, replay_call = mock_remote_client.execute.call_args_list
+        assert "session.pkl" in load_call[0][1]
+        assert replay_call[0][1] == "y = 2"
+        assert notebook.history == ["x = 1\n\ny = 2"]
+
+    async def test_load_from_file_replays_all_when_snapshot_fails(
+        self, notebook, mock_remote_client
+    ):
+        """Test the whole history is replayed when the snapshot cannot load."""
+        history = "\nx = 1\n\ny = 2\n"
+        meta = _snapshot_meta(history, len("\nx = 1\n"))
+        mock_remote_client.get_file_contents.side_effect = lambda path: {
+            "content": history if path.endswith("history.txt") else meta
+        }
+
+        async def execute(kernel_id, code, **kwargs):
+            if "session.pkl" in code:
+                return {"error": ["Error: PicklingError: ..."], "result": []}
+            return {"error": [], "result": []}
 
-    @pytest.mark.asyncio
-    async def test_load_from_file_exception(self, mock_remote_client):
-        """Test loading from file with exception."""
-        notebook = Notebook(
-            session_id="test-session-1",
-            remote_client=mock_remote_client,
-            session_directory="/home/jovyan/sessions/test-session-1",
-        )
-        await notebook.connect()
+        mock_remote_client.execute.side_effect = execute
 
-        # Mock get_file_contents to raise exception
-        mock_remote_client.get_file_contents.side_effect = Exception("Unexpected error")
+        result = await notebook.load_from_file()
+
+        assert result is True
+        assert mock_remote_client.execute.call_args[0][1] == "x = 1\n\ny = 2"
+
+    async def test_load_from_file_ignores_snapshot_of_other_history(
+        self, notebook, mock_remote_client
+    ):
+        """Test a snapshot is not loaded once the history it covers changed."""
+        history = "\nx = 1\n\ny = 2\n"
+        meta = _snapshot_meta("\nx = 2\n", len("\nx = 1\n"))
+        mock_remote_client.get_file_contents.side_effect = lambda path: {
+            "content": history if path.endswith("history.txt") else meta
+        }
 
         result = await notebook.load_from_file()
 
-        assert result is False
+        assert result is True
+        mock_remote_client.execute.assert_called_once()
+        assert mock_remote_client.execute.call_args[0][1] == "x = 1\n\ny = 2"
 
 
 class TestClose:
     """Test notebook cleanup."""
 
-    @pytest.mark.asyncio
-    async def test_close(self, mock_remote_client):
+    async def test_close(self, notebook, mock_remote_client):
         """Test closing notebook shuts down kernel."""
-        notebook = Notebook(
-            session_id="test-session-1",
-            remote_client=mock_remote_client,
-            session_directory="/home/jovyan/sessions/test-session-1",
-        )
-        await notebook.connect()
-
         notebook.close()
 
         # Verify kernel was shut down
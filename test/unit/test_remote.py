@@ -6,15 +6,39 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 import requests
+import websockets
 
 from jupyter_interpreter_mcp.remote import (
     JupyterAuthError,
     JupyterConnectionError,
     JupyterExecutionError,
+    JupyterNotFoundError,
     RemoteJupyterClient,
 )
 
 
+def _recv_replies(sent_messages, *replies):
+    """Build a WebSocket recv side effect answering the first sent request.
+
+    Each reply is a ``(msg_type, content)`` pair; once they are used up the
+    kernel reports itself idle.
+    """
+    pending = iter(replies)
+
+    async def recv():
+        await asyncio.sleep(0.01)
+        msg_type, content = next(pending, ("status", {"execution_state": "idle"}))
+        return json.dumps(
+            {
+                "msg_type": msg_type,
+                "parent_header": {"msg_id": sent_messages[0]["header"]["msg_id"]},
+                "content": content,
+            }
+        )
+
+    return recv
+
+
 class TestRemoteJupyterClientInit:
     """Test RemoteJupyterClient initialization."""
 
@@ -33,6 +57,13 @@ class TestRemoteJupyterClientInit:
         )
         assert client.base_url == "http://localhost:8888"
 
+    def test_init_websocket_base(self):
+        """Test the WebSocket base URL keeps the scheme's security and path."""
+        client = RemoteJupyterClient(
+            base_url="https://hub.example.com/user/alice/", auth_token="test-token"
+        )
+        assert client._ws_base == "wss://hub.example.com/user/alice"
+
 
 class TestAuthHeaders:
     """Test authentication header generation."""
@@ -46,6 +77,46 @@ class TestAuthHeaders:
         assert headers["Authorization"] == "token test-token"
         assert headers["Content-Type"] == "application/json"
 
+    def test_session_carries_auth_headers(self):
+        """Test the pooled HTTP session sends auth headers on every request."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+        assert client._session.headers["Authorization"] == "token test-token"
+        assert client._session.headers["Content-Type"] == "application/json"
+
+    def test_get_auth_headers_returns_copy(self):
+        """Test callers cannot modify the client's cached headers."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+        client._get_auth_headers()["Authorization"] = "token other"
+        assert client._get_auth_headers()["Authorization"] == "token test-token"
+
+    def test_get_auth_headers_without_token(self):
+        """Test no Authorization header is sent without a token."""
+        client = RemoteJupyterClient(base_url="http://localhost:8888", auth_token="")
+        assert client._get_auth_headers() == {"Content-Type": "application/json"}
+
+
+class TestResolvePath:
+    """Test Contents API path resolution."""
+
+    def test_resolve_absolute_path(self):
+        """Test absolute paths are made relative to the Jupyter root."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="token"
+        )
+        assert client._resolve_path("/home/jovyan/sessions/abc") == "sessions/abc"
+
+    def test_resolve_path_rejects_escaping_paths(self):
+        """Test relative paths escaping the Jupyter root are rejected."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="token"
+        )
+        with pytest.raises(ValueError, match="escapes the Jupyter root"):
+            client._resolve_path("../etc/passwd")
+
 
 class TestMakeRequest:
     """Test HTTP request wrapper."""
@@ -58,10 +129,47 @@ class TestMakeRequest:
         mock_response = Mock()
         mock_response.status_code = 200
 
-        with patch("requests.request", return_value=mock_response):
+        with patch.object(
+            client._session, "request", return_value=mock_response
+        ) as mock_request:
             result = client._make_request("GET", "/api/kernels")
             assert result == mock_response
             assert result.status_code == 200
+            mock_request.assert_called_once_with(
+                "GET", "http://localhost:8888/api/kernels", timeout=30
+            )
+
+    def test_make_request_keeps_base_path(self):
+        """Test endpoints are appended to a base URL with a path prefix."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888/user/alice", auth_token="token"
+        )
+        mock_response = Mock()
+        mock_response.status_code = 200
+
+        with patch.object(
+            client._session, "request", return_value=mock_response
+        ) as mock_request:
+            client._make_request("GET", "api/kernels")
+            mock_request.assert_called_once_with(
+                "GET", "http://localhost:8888/user/alice/api/kernels", timeout=30
+            )
+
+    def test_make_request_reuses_session(self):
+        """Test consecutive requests go through the same pooled session."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="token"
+        )
+        mock_response = Mock()
+        mock_response.status_code = 200
+
+        with patch.object(
+            client._session, "request", return_value=mock_response
+        ) as mock_request:
+            client._make_request("GET", "/api/kernels")
+            client._make_request("GET", "/api/contents")
+
+        assert mock_request.call_count == 2
 
     def test_make_request_connection_error(self):
         """Test connection error."""
@@ -69,7 +177,11 @@ class TestMakeRequest:
             base_url="http://localhost:8888", auth_token="token"
         )
 
-        with patch("requests.request", side_effect=requests.ConnectionError("Failed")):
+        with patch.object(
+            client._session,
+            "request",
+            side_effect=requests.ConnectionError("Failed"),
+        ):
             with pytest.raises(JupyterConnectionError, match="Cannot connect"):
                 client._make_request("GET", "/api/kernels")
 
@@ -79,7 +191,9 @@ class TestMakeRequest:
             base_url="http://localhost:8888", auth_token="token"
         )
 
-        with patch("requests.request", side_effect=requests.Timeout("Timeout")):
+        with patch.object(
+            client._session, "request", side_effect=requests.Timeout("Timeout")
+        ):
             with pytest.raises(JupyterConnectionError, match="timed out"):
                 client._make_request("GET", "/api/kernels")
 
@@ -92,7 +206,7 @@ class TestMakeRequest:
         mock_response.status_code = 401
         mock_response.text = "Unauthorized"
 
-        with patch("requests.request", return_value=mock_response):
+        with patch.object(client._session, "request", return_value=mock_response):
             with pytest.raises(JupyterAuthError, match="Authentication failed"):
                 client._make_request("GET", "/api/kernels")
 
@@ -105,7 +219,7 @@ class TestMakeRequest:
         mock_response.status_code = 403
         mock_response.text = "Forbidden"
 
-        with patch("requests.request", return_value=mock_response):
+        with patch.object(client._session, "request", return_value=mock_response):
             with pytest.raises(JupyterAuthError, match="Authorization failed"):
                 client._make_request("GET", "/api/kernels")
 
@@ -184,6 +298,33 @@ class TestCreateKernel:
                 client.create_kernel()
 
 
+class TestIsKernelAlive:
+    """Test kernel liveness checks."""
+
+    @pytest.mark.parametrize(
+        "status_code, state, expected",
+        [(200, "idle", True), (200, "dead", False), (404, None, False)],
+    )
+    def test_is_kernel_alive(self, status_code, state, expected):
+        """Test culled and dead kernels are reported as not alive."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="token"
+        )
+        mock_response = Mock()
+        mock_response.status_code = status_code
+        mock_response.json.return_value = {"id": "k", "execution_state": state}
+        side_effect = (
+            requests.HTTPError(response=mock_response) if status_code == 404 else None
+        )
+
+        with patch.object(
+            client, "_make_request", return_value=mock_response, side_effect=side_effect
+        ) as mock_request:
+            assert client.is_kernel_alive("k") is expected
+
+        mock_request.assert_called_once_with("GET", "/api/kernels/k")
+
+
 class TestShutdownKernel:
     """Test kernel shutdown."""
 
@@ -217,12 +358,33 @@ class TestShutdownKernel:
             with pytest.raises(JupyterConnectionError, match="Failed to shutdown"):
                 client.shutdown_kernel("kernel-123")
 
+    @pytest.mark.asyncio
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
+    async def test_close_kernel_connection(self, mock_connect):
+        """Test the kernel's WebSocket is closed so a thread can shut it down."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="token"
+        )
+        mock_ws = AsyncMock()
+        mock_connect.return_value = mock_ws
+        sent_messages = []
+        mock_ws.send = AsyncMock(
+            side_effect=lambda data: sent_messages.append(json.loads(data))
+        )
+        mock_ws.recv = AsyncMock(side_effect=_recv_replies(sent_messages))
+        await client.execute("kernel-123", "x = 1")
+
+        await client.close_kernel_connection("kernel-123")
+
+        mock_ws.close.assert_awaited_once()
+        assert "kernel-123" not in client._ws_connections
+
 
 class TestExecute:
     """Test WebSocket code execution."""
 
     @pytest.mark.asyncio
-    @patch("websockets.connect")
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
     async def test_execute_success(self, mock_connect):
         """Test successful code execution via WebSocket."""
         client = RemoteJupyterClient(
@@ -231,7 +393,7 @@ class TestExecute:
 
         # Mock WebSocket connection with AsyncMock
         mock_ws = AsyncMock()
-        mock_connect.return_value.__aenter__.return_value = mock_ws
+        mock_connect.return_value = mock_ws
 
         # Capture the msg_id from the sent message
         sent_messages = []
@@ -241,33 +403,12 @@ class TestExecute:
 
         mock_ws.send = AsyncMock(side_effect=capture_send)
 
-        # Mock WebSocket messages with proper parent_header
-        call_count = [0]
-
-        async def mock_recv_side_effect():
-            if call_count[0] == 0:
-                # Wait for send to be called first
-                await asyncio.sleep(0.01)
-                msg_id = sent_messages[0]["header"]["msg_id"]
-                call_count[0] += 1
-                return json.dumps(
-                    {
-                        "msg_type": "stream",
-                        "parent_header": {"msg_id": msg_id},
-                        "content": {"name": "stdout", "text": "Hello, World!\n"},
-                    }
-                )
-            else:
-                msg_id = sent_messages[0]["header"]["msg_id"]
-                return json.dumps(
-                    {
-                        "msg_type": "status",
-                        "parent_header": {"msg_id": msg_id},
-                        "content": {"execution_state": "idle"},
-                    }
-                )
-
-        mock_ws.recv = AsyncMock(side_effect=mock_recv_side_effect)
+        mock_ws.recv = AsyncMock(
+            side_effect=_recv_replies(
+                sent_messages,
+                ("stream", {"name": "stdout", "text": "Hello, World!\n"}),
+            )
+        )
 
         result = await client.execute("kernel-123", "print('Hello, World!')")
 
@@ -275,7 +416,53 @@ class TestExecute:
         assert "Hello, World!" in result["result"][0]
 
     @pytest.mark.asyncio
-    @patch("websockets.connect")
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
+    async def test_execute_request_message(self, mock_connect):
+        """Test the execute_request sent to the kernel is well-formed JSON."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+
+        mock_ws = AsyncMock()
+        mock_connect.return_value = mock_ws
+        sent_messages = []
+
+        async def capture_send(data):
+            sent_messages.append(json.loads(data))
+
+        mock_ws.send = AsyncMock(side_effect=capture_send)
+
+        async def idle():
+            return json.dumps(
+                {
+                    "msg_type": "status",
+                    "parent_header": {"msg_id": sent_messages[-1]["header"]["msg_id"]},
+                    "content": {"execution_state": "idle"},
+                }
+            )
+
+        mock_ws.recv = AsyncMock(side_effect=idle)
+
+        code = 'print("caf\u00e9 \\ %s")\n\tx = {"a": 1}'
+        await client.execute("kernel-123", code, store_history=False)
+
+        message = sent_messages[0]
+        assert message["header"]["msg_type"] == "execute_request"
+        assert message["header"]["version"] == "5.3"
+        assert message["header"]["session"]
+        assert message["channel"] == "shell"
+        assert message["parent_header"] == {}
+        assert message["content"] == {
+            "code": code,
+            "silent": False,
+            "store_history": False,
+            "user_expressions": {},
+            "allow_stdin": False,
+            "stop_on_error": True,
+        }
+
+    @pytest.mark.asyncio
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
     async def test_execute_with_result(self, mock_connect):
         """Test code execution with execute_result."""
         client = RemoteJupyterClient(
@@ -284,7 +471,7 @@ class TestExecute:
 
         # Mock WebSocket connection
         mock_ws = AsyncMock()
-        mock_connect.return_value.__aenter__.return_value = mock_ws
+        mock_connect.return_value = mock_ws
 
         sent_messages = []
 
@@ -293,31 +480,11 @@ class TestExecute:
 
         mock_ws.send = AsyncMock(side_effect=capture_send)
 
-        call_count = [0]
-
-        async def mock_recv_side_effect():
-            await asyncio.sleep(0.01)
-            msg_id = sent_messages[0]["header"]["msg_id"]
-
-            if call_count[0] == 0:
-                call_count[0] += 1
-                return json.dumps(
-                    {
-                        "msg_type": "execute_result",
-                        "parent_header": {"msg_id": msg_id},
-                        "content": {"data": {"text/plain": "42"}},
-                    }
-                )
-            else:
-                return json.dumps(
-                    {
-                        "msg_type": "status",
-                        "parent_header": {"msg_id": msg_id},
-                        "content": {"execution_state": "idle"},
-                    }
-                )
-
-        mock_ws.recv = AsyncMock(side_effect=mock_recv_side_effect)
+        mock_ws.recv = AsyncMock(
+            side_effect=_recv_replies(
+                sent_messages, ("execute_result", {"data": {"text/plain": "42"}})
+            )
+        )
 
         result = await client.execute("kernel-123", "21 + 21")
 
@@ -325,7 +492,7 @@ class TestExecute:
         assert "Execution Result: 42" in result["result"][0]
 
     @pytest.mark.asyncio
-    @patch("websockets.connect")
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
     async def test_execute_error(self, mock_connect):
         """Test code execution error via WebSocket."""
         client = RemoteJupyterClient(
@@ -334,7 +501,7 @@ class TestExecute:
 
         # Mock WebSocket connection
         mock_ws = AsyncMock()
-        mock_connect.return_value.__aenter__.return_value = mock_ws
+        mock_connect.return_value = mock_ws
 
         sent_messages = []
 
@@ -343,38 +510,22 @@ class TestExecute:
 
         mock_ws.send = AsyncMock(side_effect=capture_send)
 
-        call_count = [0]
-
-        async def mock_recv_side_effect():
-            await asyncio.sleep(0.01)
-            msg_id = sent_messages[0]["header"]["msg_id"]
-
-            if call_count[0] == 0:
-                call_count[0] += 1
-                return json.dumps(
-                    {
-                        "msg_type": "error",
-                        "parent_header": {"msg_id": msg_id},
-                        "content": {
-                            "ename": "NameError",
-                            "evalue": "name 'x' is not defined",
-                            "traceback": [
-                                "Traceback...",
-                                "NameError: name 'x' is not defined",
-                            ],
-                        },
-                    }
-                )
-            else:
-                return json.dumps(
+        mock_ws.recv = AsyncMock(
+            side_effect=_recv_replies(
+                sent_messages,
+                (
+                    "error",
                     {
-                        "msg_type": "status",
-                        "parent_header": {"msg_id": msg_id},
-                        "content": {"execution_state": "idle"},
-                    }
-                )
-
-        mock_ws.recv = AsyncMock(side_effect=mock_recv_side_effect)
+                        "ename": "NameError",
+                        "evalue": "name 'x' is not defined",
+                        "traceback": [
+                            "Traceback...",
+                            "NameError: name 'x' is not defined",
+                        ],
+                    },
+                ),
+            )
+        )
 
         result = await client.execute("kernel-123", "print(x)")
 
@@ -382,7 +533,39 @@ class TestExecute:
         assert result["result"] == []
 
     @pytest.mark.asyncio
-    @patch("websockets.connect")
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
+    async def test_execute_aborted(self, mock_connect):
+        """Test that a request aborted by the kernel is reported as an error."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+
+        mock_ws = AsyncMock()
+        mock_connect.return_value = mock_ws
+
+        sent_messages = []
+
+        async def capture_send(data):
+            sent_messages.append(json.loads(data))
+
+        mock_ws.send = AsyncMock(side_effect=capture_send)
+
+        mock_ws.recv = AsyncMock(
+            side_effect=_recv_replies(
+                sent_messages, ("execute_reply", {"status": "aborted"})
+            )
+        )
+
+        result = await client.execute("kernel-123", "x = 1", stop_on_error=False)
+
+        assert sent_messages[0]["content"]["stop_on_error"] is False
+        assert result["error"] == [
+            "Error: Aborted: a previous execution on the kernel failed"
+        ]
+        assert result["result"] == []
+
+    @pytest.mark.asyncio
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
     async def test_execute_timeout(self, mock_connect):
         """Test code execution timeout."""
         client = RemoteJupyterClient(
@@ -391,7 +574,7 @@ class TestExecute:
 
         # Mock WebSocket connection
         mock_ws = AsyncMock()
-        mock_connect.return_value.__aenter__.return_value = mock_ws
+        mock_connect.return_value = mock_ws
 
         sent_messages = []
 
@@ -419,6 +602,236 @@ class TestExecute:
                 "kernel-123", "import time; time.sleep(100)", timeout=0.1
             )
 
+    @pytest.mark.asyncio
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
+    async def test_execute_timeout_resets_per_message(self, mock_connect):
+        """Test the timeout bounds the gap between messages, not the total."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+
+        mock_ws = AsyncMock()
+        mock_connect.return_value = mock_ws
+        sent_messages = []
+
+        async def capture_send(data):
+            sent_messages.append(json.loads(data))
+
+        mock_ws.send = AsyncMock(side_effect=capture_send)
+
+        messages = iter(
+            [("stream", {"text": f"{i}\n"}) for i in range(5)]
+            + [("status", {"execution_state": "idle"})]
+        )
+
+        async def slow_recv():
+            # Each message arrives well within the timeout, but together
+            # they take longer than it
+            await asyncio.sleep(0.05)
+            msg_type, content = next(messages)
+            return json.dumps(
+                {
+                    "msg_type": msg_type,
+                    "parent_header": {"msg_id": sent_messages[0]["header"]["msg_id"]},
+                    "content": content,
+                }
+            )
+
+        mock_ws.recv = AsyncMock(side_effect=slow_recv)
+
+        result = await client.execute("kernel-123", "slow()", timeout=0.15)
+
+        assert result["result"] == [f"{i}\n" for i in range(5)]
+        assert result["error"] == []
+
+    @pytest.mark.asyncio
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
+    async def test_execute_skips_unrelated_frames(self, mock_connect):
+        """Test frames for other requests and binary frames are ignored."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+
+        mock_ws = AsyncMock()
+        mock_connect.return_value = mock_ws
+        sent_messages = []
+
+        async def capture_send(data):
+            sent_messages.append(json.loads(data))
+
+        mock_ws.send = AsyncMock(side_effect=capture_send)
+
+        def reply(parent_msg_id, msg_type, content):
+            return json.dumps(
+                {
+                    "msg_type": msg_type,
+                    "parent_header": {"msg_id": parent_msg_id},
+                    "content": content,
+                }
+            )
+
+        async def recv():
+            msg_id = sent_messages[0]["header"]["msg_id"]
+            return next(frames)(msg_id)
+
+        frames = iter(
+            [
+                lambda _: reply("other", "stream", {"text": "not ours\n"}),
+                lambda _: b"\x00\x00\x00\x02binary comm frame",
+                # Not JSON, but never parsed since it is not ours
+                lambda _: "{truncated",
+                lambda msg_id: reply(msg_id, "stream", {"text": "ours\n"}),
+                lambda msg_id: reply(msg_id, "status", {"execution_state": "idle"}),
+            ]
+        )
+        mock_ws.recv = AsyncMock(side_effect=recv)
+
+        result = await client.execute("kernel-123", "print('ours')")
+
+        assert result == {"error": [], "result": ["ours\n"]}
+
+    @pytest.mark.asyncio
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
+    async def test_execute_reuses_websocket(self, mock_connect):
+        """Test consecutive executions on a kernel share one WebSocket."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+
+        mock_ws = AsyncMock()
+        mock_connect.return_value = mock_ws
+        sent_messages = []
+
+        async def capture_send(data):
+            sent_messages.append(json.loads(data))
+
+        async def reply_idle():
+            await asyncio.sleep(0)
+            return json.dumps(
+                {
+                    "msg_type": "status",
+                    "parent_header": {"msg_id": sent_messages[-1]["header"]["msg_id"]},
+                    "content": {"execution_state": "idle"},
+                }
+            )
+
+        mock_ws.send = AsyncMock(side_effect=capture_send)
+        mock_ws.recv = AsyncMock(side_effect=reply_idle)
+
+        await client.execute("kernel-123", "x = 1")
+        await client.execute("kernel-123", "y = 2")
+
+        mock_connect.assert_awaited_once_with(
+            "ws://localhost:8888/api/kernels/kernel-123/channels?token=test-token",
+            compression=None,
+            max_size=2**24,
+        )
+        assert len(sent_messages) == 2
+
+    @pytest.mark.asyncio
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
+    async def test_execute_reconnects_closed_websocket(self, mock_connect):
+        """Test a cached WebSocket closed by the server is replaced."""
+        from websockets.exceptions import ConnectionClosed
+
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+
+        stale_ws = AsyncMock()
+        stale_ws.send = AsyncMock(side_effect=ConnectionClosed(None, None))
+        fresh_ws = AsyncMock()
+        mock_connect.return_value = fresh_ws
+        sent_messages = []
+
+        async def capture_send(data):
+            sent_messages.append(json.loads(data))
+
+        async def reply_idle():
+            return json.dumps(
+                {
+                    "msg_type": "status",
+                    "parent_header": {"msg_id": sent_messages[-1]["header"]["msg_id"]},
+                    "content": {"execution_state": "idle"},
+                }
+            )
+
+        fresh_ws.send = AsyncMock(side_effect=capture_send)
+        fresh_ws.recv = AsyncMock(side_effect=reply_idle)
+        client._kernel_connection("kernel-123").websocket = stale_ws
+
+        result = await client.execute("kernel-123", "x = 1")
+
+        assert result == {"error": [], "result": []}
+        mock_connect.assert_awaited_once()
+        assert len(sent_messages) == 1
+
+    @pytest.mark.asyncio
+    @patch.object(websockets, "connect", new_callable=AsyncMock)
+    async def test_concurrent_executions_are_pipelined(self, mock_connect):
+        """Test requests are sent without waiting and replies are routed back."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+
+        mock_ws = AsyncMock()
+        mock_connect.return_value = mock_ws
+        inbox: asyncio.Queue[str] = asyncio.Queue()
+        sent_messages = []
+
+        async def kernel(data):
+            sent_messages.append(json.loads(data))
+            if len(sent_messages) < 3:
+                return
+            # Only answer once all requests are in flight, in the order a
+            # sequential kernel would: output, then idle, per request
+            for request in sent_messages:
+                parent = {"msg_id": request["header"]["msg_id"]}
+                code = request["content"]["code"]
+                for msg_type, content in (
+                    ("stream", {"name": "stdout", "text": f"ran {code}"}),
+                    ("status", {"execution_state": "idle"}),
+                ):
+                    inbox.put_nowait(
+                        json.dumps(
+                            {
+                                "msg_type": msg_type,
+                                "parent_header": parent,
+                                "content": content,
+                            }
+                        )
+                    )
+
+        mock_ws.send = AsyncMock(side_effect=kernel)
+        mock_ws.recv = AsyncMock(side_effect=inbox.get)
+
+        results = await asyncio.gather(
+            client.execute("kernel-123", "a", timeout=1),
+            client.execute("kernel-123", "b", timeout=1),
+            client.execute("kernel-123", "c", timeout=1),
+        )
+
+        assert [r["result"] for r in results] == [["ran a"], ["ran b"], ["ran c"]]
+        assert len(sent_messages) == 3
+        mock_connect.assert_awaited_once()
+        assert client._ws_connections["kernel-123"].replies == {}
+
+    @pytest.mark.asyncio
+    async def test_shutdown_kernel_closes_websocket(self):
+        """Test shutting down a kernel closes its cached WebSocket."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="test-token"
+        )
+        mock_ws = AsyncMock()
+        client._kernel_connection("kernel-123").websocket = mock_ws
+
+        with patch.object(client, "_make_request"):
+            client.shutdown_kernel("kernel-123")
+        await asyncio.gather(*client._closing)
+
+        mock_ws.close.assert_awaited_once()
+        assert "kernel-123" not in client._ws_connections
+
 
 class TestGetFileContents:
     """Test get_file_contents method."""
@@ -471,7 +884,20 @@ class TestGetFileContents:
         assert result["content"] == "iVBORw0KGgo="
 
     def test_get_file_contents_not_found(self):
-        """Test that 404 raises JupyterConnectionError."""
+        """Test that 404 raises JupyterNotFoundError."""
+        client = RemoteJupyterClient(
+            base_url="http://localhost:8888", auth_token="token"
+        )
+        mock_response = Mock()
+        mock_response.status_code = 404
+        http_error = requests.HTTPError(response=mock_response)
+
+        with patch.object(client, "_make_request", side_effect=http_error):
+            with pytest.raises(JupyterNotFoundError, match="File not found"):
+                client.get_file_contents("sessions/abc/missing.txt")
+
+    def test_get_file_contents_remembers_missing_files(self):
+        """Test a 404 is remembered until the file is written."""
         client = RemoteJupyterClient(
             base_url="http://localhost:8888", auth_token="token"
         )
@@ -480,9 +906,24 @@ class TestGetFileContents:
         http_error = requests.HTTPError(response=mock_response)
 
         with patch.object(client, "_make_request", side_effect=http_error):
-            with pytest.raises(JupyterConnectionError, match="File not found"):
+            with pytest.raises(JupyterNotFoundError):
+                client.get_file_contents("sessions/abc/missing.txt")
+
+        assert client.known_missing("sessions/abc/missing.txt")
+        assert not client.known_missing("sessions/abc/other.txt")
+
+        with patch.object(client, "_make_request", return_value=Mock()):
+            client.put_contents("sessions/abc/missing.txt", "hello")
+
+        assert not client.known_missing("sessions/abc/missing.txt")
+
+        # Once written, a later 404 is not trusted: the file may be recreated
+        with patch.object(client, "_make_request", side_effect=http_error):
+            with pytest.raises(JupyterNotFoundError):
                 client.get_file_contents("sessions/abc/missing.txt")
 
+        assert not client.known_missing("sessions/abc/missing.txt")
+
 
 class TestPutContents:
     """Test put_contents method."""
@@ -1,10 +1,14 @@
 """Unit tests for server module argument parsing."""
 
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock, call, patch
 
 import pytest
 
-from jupyter_interpreter_mcp.remote import JupyterAuthError, JupyterConnectionError
+from jupyter_interpreter_mcp.remote import (
+    JupyterAuthError,
+    JupyterConnectionError,
+    JupyterExecutionError,
+)
 from jupyter_interpreter_mcp.session import Session
 
 
@@ -291,6 +295,7 @@ class TestLazySessionRestore:
         server.remote_client.update_session_metadata = AsyncMock()
 
         result = await server.execute_code("print('ok')", session_id)
+        await server.flush_history()
 
         assert result["error"] == []
         assert result["session_id"] == session_id
@@ -299,6 +304,475 @@ class TestLazySessionRestore:
         mock_notebook.dump_to_file.assert_called_once()
 
 
+class TestCreateSession:
+    """Test create_session tool."""
+
+    @pytest.mark.asyncio
+    async def test_create_session_registers_session(self):
+        """Test a new session gets a kernel, a directory and a notebook."""
+        from jupyter_interpreter_mcp import server
+
+        server.sessions = {}
+        server.notebooks = {}
+        server.sessions_dir = "/home/jovyan/sessions"
+        server.remote_client = Mock()
+        server.remote_client.create_kernel.return_value = "kernel-1"
+        server.remote_client.create_session_directory = AsyncMock()
+        server.remote_client.execute = AsyncMock(
+            return_value={"error": [], "result": []}
+        )
+
+        result = await server.create_session()
+
+        session_id = result["session_id"]
+        assert server.sessions[session_id].kernel_id == "kernel-1"
+        assert server.notebooks[session_id].kernel_id == "kernel-1"
+        server.remote_client.create_session_directory.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_create_session_directory_failure_shuts_down_kernel(self):
+        """Test the kernel is shut down when the directory cannot be created."""
+        from jupyter_interpreter_mcp import server
+
+        server.sessions = {}
+        server.notebooks = {}
+        server.remote_client = Mock()
+        server.remote_client.create_kernel.return_value = "kernel-1"
+        server.remote_client.create_session_directory = AsyncMock(
+            side_effect=JupyterConnectionError("Cannot connect")
+        )
+
+        result = await server.create_session()
+
+        assert "Failed to create session" in result["error"]
+        server.remote_client.shutdown_kernel.assert_called_once_with("kernel-1")
+        assert server.sessions == {}
+
+
+class TestRestoreSessionsFromDisk:
+    """Test restoring sessions saved on the remote filesystem."""
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.session_ttl", 0)
+    async def test_restore_reads_legacy_metadata_file(self):
+        """Test only the old metadata filename is tried as a fallback."""
+        import json
+
+        from jupyter_interpreter_mcp import server
+        from jupyter_interpreter_mcp.remote import JupyterNotFoundError
+
+        server.sessions = {}
+        server.notebooks = {}
+        server.sessions_dir = "/home/jovyan/sessions"
+        server.remote_client = Mock()
+        server.remote_client.get_contents.return_value = {
+            "content": [{"type": "directory", "name": "s1"}]
+        }
+        legacy_meta = json.dumps({"created_at": 1.0, "last_access": 2.0})
+
+        def get_file_contents(path):
+            if path == "/home/jovyan/sessions/s1/.session.json":
+                return {"content": legacy_meta}
+            raise JupyterNotFoundError("File not found")
+
+        server.remote_client.get_file_contents.side_effect = get_file_contents
+        server.remote_client.known_missing.return_value = False
+        server.remote_client.create_kernel.return_value = "kernel-1"
+        server.remote_client.execute = AsyncMock(
+            return_value={"error": [], "result": []}
+        )
+
+        restored = await server.restore_sessions_from_disk("s1")
+
+        assert restored == 1
+        assert server.sessions["s1"].last_access == 2.0
+        # The session directory is not listed to guess the metadata file
+        server.remote_client.get_contents.assert_called_once_with(
+            "/home/jovyan/sessions"
+        )
+
+
+class TestSessionEviction:
+    """Test unloading of least recently used sessions."""
+
+    @staticmethod
+    def _add_session(server, session_id, last_access):
+        server.sessions[session_id] = Session(
+            id=session_id,
+            kernel_id=f"kernel-{session_id}",
+            created_at=0.0,
+            last_access=last_access,
+            directory=f"/sessions/{session_id}",
+        )
+        notebook = Mock(is_busy=False)
+        notebook.dump_to_file = AsyncMock()
+        notebook.snapshot = AsyncMock()
+        server.notebooks[session_id] = notebook
+        return notebook
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.max_sessions", 2)
+    async def test_evicts_least_recently_used(self):
+        """Test the oldest sessions are saved, shut down and unloaded."""
+        from jupyter_interpreter_mcp import server
+
+        server.sessions = {}
+        server.notebooks = {}
+        server.remote_client = Mock()
+        server.remote_client.close_kernel_connection = AsyncMock()
+        oldest = self._add_session(server, "a", 10.0)
+        self._add_session(server, "b", 30.0)
+        # Just added, but with an old last_access (e.g. restored from disk)
+        self._add_session(server, "c", 5.0)
+
+        evicted = await server.evict_idle_sessions(keep="c")
+
+        assert evicted == 1
+        assert set(server.sessions) == {"b", "c"}
+        assert set(server.notebooks) == {"b", "c"}
+        oldest.dump_to_file.assert_awaited_once()
+        await server.finish_evictions()
+        oldest.snapshot.assert_awaited_once()
+        # The WebSocket is closed on the loop before the kernel is shut down
+        server.remote_client.close_kernel_connection.assert_awaited_once_with(
+            "kernel-a"
+        )
+        server.remote_client.shutdown_kernel.assert_called_once_with("kernel-a")
+        assert server._evictions == {}
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.max_sessions", 1)
+    async def test_snapshot_runs_in_background(self):
+        """Test eviction does not wait for the snapshot of the evicted session."""
+        import asyncio
+
+        from jupyter_interpreter_mcp import server
+
+        server.sessions = {}
+        server.notebooks = {}
+        server.remote_client = Mock()
+        server.remote_client.close_kernel_connection = AsyncMock()
+        release = asyncio.Event()
+        oldest = self._add_session(server, "a", 10.0)
+        oldest.snapshot.side_effect = release.wait
+        self._add_session(server, "b", 20.0)
+
+        assert await server.evict_idle_sessions(keep="b") == 1
+        await asyncio.sleep(0)
+        oldest.snapshot.assert_awaited_once()
+        server.remote_client.shutdown_kernel.assert_not_called()
+
+        # Restoring the session waits for its snapshot to be written
+        server.remote_client.get_contents.side_effect = JupyterConnectionError()
+        restore = asyncio.create_task(server.restore_sessions_from_disk("a"))
+        await asyncio.sleep(0.01)
+        assert not restore.done()
+
+        release.set()
+        assert await restore == 0
+        server.remote_client.shutdown_kernel.assert_called_once_with("kernel-a")
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.max_sessions", 1)
+    async def test_finish_evictions_timeout_still_shuts_down_kernel(self):
+        """Test a snapshot outlasting the shutdown timeout is abandoned."""
+        import asyncio
+
+        from jupyter_interpreter_mcp import server
+
+        server.sessions = {}
+        server.notebooks = {}
+        server.remote_client = Mock()
+        server.remote_client.close_kernel_connection = AsyncMock()
+        self._add_session(server, "a", 10.0).snapshot.side_effect = asyncio.Event().wait
+        self._add_session(server, "b", 20.0)
+        await server.evict_idle_sessions(keep="b")
+
+        await server.finish_evictions(timeout=0.01)
+
+        server.remote_client.shutdown_kernel.assert_called_once_with("kernel-a")
+        assert server._evictions == {}
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.max_sessions", 1)
+    async def test_skips_sessions_with_running_code(self):
+        """Test a session executing a long cell is not evicted."""
+        from jupyter_interpreter_mcp import server
+
+        server.sessions = {}
+        server.notebooks = {}
+        server.remote_client = Mock()
+        server.remote_client.close_kernel_connection = AsyncMock()
+        self._add_session(server, "a", 10.0).is_busy = True
+        self._add_session(server, "b", 20.0)
+        self._add_session(server, "c", 30.0)
+
+        evicted = await server.evict_idle_sessions(keep="c")
+        await server.finish_evictions()
+
+        assert evicted == 1
+        assert set(server.sessions) == {"a", "c"}
+        server.remote_client.shutdown_kernel.assert_called_once_with("kernel-b")
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.max_sessions", 0)
+    async def test_no_limit(self):
+        """Test nothing is evicted when the limit is disabled."""
+        from jupyter_interpreter_mcp import server
+
+        server.sessions = {}
+        server.notebooks = {}
+        server.remote_client = Mock()
+        server.remote_client.close_kernel_connection = AsyncMock()
+        for i in range(3):
+            self._add_session(server, str(i), float(i))
+
+        assert await server.evict_idle_sessions() == 0
+        assert len(server.sessions) == 3
+        server.remote_client.shutdown_kernel.assert_not_called()
+
+
+class TestKernelPool:
+    """Test the pool of pre-started kernels."""
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.kernel_pool_size", 2)
+    async def test_pool_fills_and_hands_out_kernels(self):
+        """Test sessions take pooled kernels and the pool is topped up."""
+        from jupyter_interpreter_mcp import server
+
+        server.remote_client = Mock()
+        server.remote_client.create_kernel.side_effect = [
+            f"kernel-{i}" for i in range(1, 4)
+        ]
+        server.start_kernel_pool()
+        await server._kernel_pool_refill
+        assert server._kernel_pool == ["kernel-1", "kernel-2"]
+
+        kernel_id = await server.acquire_kernel()
+        assert kernel_id == "kernel-2"
+        await server._kernel_pool_refill
+        assert server._kernel_pool == ["kernel-1", "kernel-3"]
+
+        await server.shutdown_kernel_pool()
+        assert server._kernel_pool == []
+        server.remote_client.shutdown_kernel.assert_has_calls(
+            [call("kernel-3"), call("kernel-1")]
+        )
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.kernel_pool_size", 2)
+    async def test_shutdown_waits_for_kernel_being_started(self):
+        """Test a kernel still starting at shutdown is shut down, not leaked."""
+        import asyncio
+        import threading
+
+        from jupyter_interpreter_mcp import server
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def create_kernel():
+            started.set()
+            release.wait(5)
+            return "kernel-1"
+
+        server.remote_client = Mock()
+        server.remote_client.create_kernel.side_effect = create_kernel
+        server.start_kernel_pool()
+        await asyncio.to_thread(started.wait, 5)
+
+        shutdown = asyncio.create_task(server.shutdown_kernel_pool())
+        await asyncio.sleep(0)
+        release.set()
+        await shutdown
+
+        server.remote_client.create_kernel.assert_called_once()
+        server.remote_client.shutdown_kernel.assert_called_once_with("kernel-1")
+        assert server._kernel_pool == []
+
+    @pytest.mark.asyncio
+    async def test_acquire_kernel_skips_dead_pooled_kernels(self, capsys):
+        """Test a pooled kernel culled while idle is replaced."""
+        from jupyter_interpreter_mcp import server
+
+        server.remote_client = Mock()
+        server.remote_client.is_kernel_alive.side_effect = lambda kernel_id: (
+            kernel_id == "kernel-1"
+        )
+        server._kernel_pool[:] = ["kernel-1", "kernel-2"]
+
+        kernel_id = await server.acquire_kernel()
+
+        assert kernel_id == "kernel-1"
+        assert server._kernel_pool == []
+        server.remote_client.shutdown_kernel.assert_called_once_with("kernel-2")
+        assert "Discarding pooled kernel kernel-2" in capsys.readouterr().err
+
+    @pytest.mark.asyncio
+    async def test_acquire_kernel_without_pool_starts_kernel(self):
+        """Test kernels are started on demand when pooling is disabled."""
+        from jupyter_interpreter_mcp import server
+
+        server.remote_client = Mock()
+        server.remote_client.create_kernel.return_value = "kernel-1"
+        server.start_kernel_pool()
+
+        assert await server.acquire_kernel() == "kernel-1"
+        assert server._kernel_pool_refill is None
+        assert server._kernel_pool == []
+        server.remote_client.create_kernel.assert_called_once_with()
+
+    @pytest.mark.asyncio
+    async def test_enter_session_directory(self):
+        """Test the kernel's working directory is changed every time."""
+        from jupyter_interpreter_mcp import server
+
+        server.remote_client = Mock()
+        server.remote_client.execute = AsyncMock(
+            return_value={"error": [], "result": []}
+        )
+
+        await server.enter_session_directory("kernel-1", "/home/jovyan/sessions/s1")
+        await server.enter_session_directory("kernel-2", "/home/jovyan/sessions/s2")
+
+        assert server.remote_client.execute.await_count == 2
+        kernel_id, code = server.remote_client.execute.call_args[0]
+        assert kernel_id == "kernel-2"
+        assert "os.chdir('/home/jovyan/sessions/s2')" in code
+        assert server.remote_client.execute.call_args[1] == {
+            "store_history": False,
+            "stop_on_error": False,
+        }
+
+    @pytest.mark.asyncio
+    async def test_enter_session_directory_failure(self):
+        """Test a kernel that cannot enter its directory is reported."""
+        from jupyter_interpreter_mcp import server
+
+        server.remote_client = Mock()
+        server.remote_client.execute = AsyncMock(
+            return_value={"error": ["Error: FileNotFoundError: missing"], "result": []}
+        )
+
+        with pytest.raises(JupyterExecutionError, match="working directory"):
+            await server.enter_session_directory("kernel-1", "/home/jovyan/sessions/s1")
+
+
+class TestHistoryWriter:
+    """Test background persistence of session history."""
+
+    @pytest.mark.asyncio
+    async def test_flush_history_writes_queued_notebooks(self):
+        """Test queued notebooks are written once the queue is flushed."""
+        from jupyter_interpreter_mcp import server
+
+        notebook = Mock()
+        notebook.session_id = "session-1"
+        notebook.dump_to_file = AsyncMock()
+
+        server.schedule_history_flush(notebook)
+        await server.flush_history()
+
+        notebook.dump_to_file.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_repeated_entries_for_a_session_are_coalesced(self):
+        """Test bursts for the same session collapse into a single write."""
+        from jupyter_interpreter_mcp import server
+
+        first = Mock()
+        first.session_id = "session-1"
+        first.dump_to_file = AsyncMock()
+        second = Mock()
+        second.session_id = "session-2"
+        second.dump_to_file = AsyncMock()
+
+        for _ in range(3):
+            server.schedule_history_flush(first)
+        server.schedule_history_flush(second)
+        await server.flush_history()
+
+        first.dump_to_file.assert_awaited_once()
+        second.dump_to_file.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.history_flush_interval", 0.2)
+    async def test_writes_within_interval_are_coalesced(self):
+        """Test a burst right after a write is held back and written once."""
+        import asyncio
+        import time
+
+        from jupyter_interpreter_mcp import server
+
+        notebook = Mock()
+        notebook.session_id = "session-1"
+        notebook.dump_to_file = AsyncMock()
+
+        server.schedule_history_flush(notebook)
+        await server.flush_history()
+        first_write = time.monotonic()
+
+        server.schedule_history_flush(notebook)
+        await asyncio.sleep(0.05)
+        server.schedule_history_flush(notebook)
+        await server.flush_history()
+
+        assert notebook.dump_to_file.await_count == 2
+        assert time.monotonic() - first_write >= 0.15
+
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.history_flush_interval", 0.5)
+    async def test_held_back_session_does_not_delay_others(self):
+        """Test a session waiting for its interval does not hold up others."""
+        import asyncio
+
+        from jupyter_interpreter_mcp import server
+
+        first = Mock()
+        first.session_id = "session-1"
+        first.dump_to_file = AsyncMock()
+        second = Mock()
+        second.session_id = "session-2"
+        second.dump_to_file = AsyncMock()
+
+        server.schedule_history_flush(first)
+        await server.flush_history()
+
+        # session-1 was just written and is held back; session-2 is not
+        server.schedule_history_flush(first)
+        server.schedule_history_flush(second)
+        await asyncio.sleep(0.1)
+
+        second.dump_to_file.assert_awaited_once()
+        assert first.dump_to_file.await_count == 1
+
+        await server.flush_history()
+        assert first.dump_to_file.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_write_failure_does_not_stop_writer(self, capsys):
+        """Test a failing write is reported and later writes still run."""
+        from jupyter_interpreter_mcp import server
+
+        failing = Mock()
+        failing.session_id = "session-1"
+        failing.dump_to_file = AsyncMock(side_effect=Exception("disk full"))
+
+        server.schedule_history_flush(failing)
+        await server.flush_history()
+
+        healthy = Mock()
+        healthy.session_id = "session-2"
+        healthy.dump_to_file = AsyncMock()
+
+        server.schedule_history_flush(healthy)
+        await server.flush_history()
+
+        healthy.dump_to_file.assert_awaited_once()
+        assert "Failed to save history for session session-1" in capsys.readouterr().err
+
+
 class TestStartupRestoreConfiguration:
     """Test startup restore configuration for performance tuning."""
 
@@ -333,6 +807,8 @@ class TestStartupRestoreConfiguration:
     @patch("jupyter_interpreter_mcp.server.mcp")
     def test_can_enable_eager_restore(self, mock_mcp, mock_client_class, mock_restore):
         """Test eager restore can still be enabled via CLI flag."""
+        from jupyter_interpreter_mcp import server
+
         mock_client = Mock()
         mock_client.validate_connection = Mock()
         mock_client_class.return_value = mock_client
@@ -342,13 +818,59 @@ class TestStartupRestoreConfiguration:
                 "sys.argv",
                 ["jupyter-interpreter-mcp", "--restore-sessions-on-startup"],
             ):
-                from jupyter_interpreter_mcp.server import main
-
-                main()
+                server.main()
 
-        mock_restore.assert_awaited_once_with()
+        # Restoring happens on the server's loop, not before it starts
+        assert server.restore_on_startup is True
+        mock_restore.assert_not_awaited()
         mock_mcp.run.assert_called_once()
 
+    @pytest.mark.asyncio
+    @patch("jupyter_interpreter_mcp.server.restore_on_startup", True)
+    @patch("jupyter_interpreter_mcp.server.session_ttl", 60.0)
+    @patch(
+        "jupyter_interpreter_mcp.server.cleanup_expired_sessions",
+        new_callable=AsyncMock,
+        return_value=0,
+    )
+    @patch(
+        "jupyter_interpreter_mcp.server.restore_sessions_from_disk",
+        new_callable=AsyncMock,
+        return_value=2,
+    )
+    async def test_lifespan_runs_startup_maintenance(
+        self, mock_restore, mock_cleanup, capsys
+    ):
+        """Test the lifespan restores and cleans up sessions before serving."""
+        from jupyter_interpreter_mcp import server
+
+        server.remote_client = Mock()
+        server.notebooks = {}
+
+        async with server._lifespan(server.mcp):
+            mock_restore.assert_awaited_once_with()
+            mock_cleanup.assert_awaited_once_with()
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "Restored 2 session(s)" in captured.err
+
+    @pytest.mark.asyncio
+    async def test_snapshot_sessions_continues_after_failure(self, capsys):
+        """Test one failing snapshot does not stop the others."""
+        from jupyter_interpreter_mcp import server
+
+        failing = Mock(session_id="a")
+        failing.snapshot = AsyncMock(side_effect=Exception("kernel died"))
+        healthy = Mock(session_id="b")
+        healthy.snapshot = AsyncMock(return_value=True)
+        server.notebooks = {"a": failing, "b": healthy}
+
+        await server.snapshot_sessions()
+
+        healthy.snapshot.assert_awaited_once_with(server._SHUTDOWN_SNAPSHOT_TIMEOUT)
+        assert "Failed to snapshot session a" in capsys.readouterr().err
+
 
 class TestListDirTool:
     """Test list_dir tool functionality."""
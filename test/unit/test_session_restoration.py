@@ -1,20 +1,8 @@
 """Test session restoration to ensure code is not duplicated on reload."""
 
-from unittest.mock import AsyncMock, Mock
-
 import pytest
 
 from jupyter_interpreter_mcp.notebook import Notebook
-from jupyter_interpreter_mcp.remote import RemoteJupyterClient
-
-
-@pytest.fixture
-def mock_remote_client():
-    """Create a mock RemoteJupyterClient for testing."""
-    client = Mock(spec=RemoteJupyterClient)
-    client.create_kernel.return_value = "kernel-123"
-    client.execute = AsyncMock(return_value={"error": [], "result": []})
-    return client
 
 
 @pytest.mark.asyncio